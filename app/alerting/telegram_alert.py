@@ -2,6 +2,8 @@
 import os
 import httpx
 
+from app import replay
+
 TELEGRAM_BOT_TOKEN = os.getenv("TELEGRAM_BOT_TOKEN")
 TELEGRAM_CHAT_ID = os.getenv("TELEGRAM_CHAT_ID")
 
@@ -9,6 +11,9 @@ async def send_telegram_alert(token_data: dict):
     if not TELEGRAM_BOT_TOKEN or not TELEGRAM_CHAT_ID:
         print("[alert] Telegram not configured correctly.")
         return
+    if replay.mode() == "replay":
+        print(f"[alert] Replay run, not sending alert for {token_data.get('name','N/A')}")
+        return
 
     message = (
         "New Token Alert:\n"
@@ -1,20 +1,112 @@
 import asyncio
-from typing import Dict, Optional, List
+from typing import Any, Dict, Optional, List, Tuple
 from pycoingecko import CoinGeckoAPI
 import logging
 
+from .fastjson import decode
+from .singleflight import SingleFlight
+from . import replay
+
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+
 logger = logging.getLogger(__name__)
 
+# DexScreener chain id -> CoinGecko asset platform id
+CHAIN_PLATFORMS = {
+    'solana': 'solana',
+    'ethereum': 'ethereum',
+    'bsc': 'binance-smart-chain',
+    'base': 'base',
+    'arbitrum': 'arbitrum-one',
+    'polygon': 'polygon-pos',
+}
+
+# Free tier: ~30 calls/min = 2 sec delay
+RATE_LIMIT_DELAY = 2.0
+
+# /coins/{id} without the heavy sections we never read
+LIGHT_COIN_PARAMS = {
+    'localization': 'false',
+    'tickers': 'false',
+    'market_data': 'true',
+    'community_data': 'true',
+    'developer_data': 'false',
+    'sparkline': 'false',
+}
+
+if msgspec is not None:
+    # Only the paths get_token_data reads; everything else is skipped while decoding
+    class _Usd(msgspec.Struct, frozen=True, omit_defaults=True):
+        usd: Any = None
+
+    class _MarketData(msgspec.Struct, frozen=True, omit_defaults=True):
+        current_price: _Usd = _Usd()
+        market_cap: _Usd = _Usd()
+        fully_diluted_valuation: _Usd = _Usd()
+        total_volume: _Usd = _Usd()
+        ath: _Usd = _Usd()
+        ath_change_percentage: _Usd = _Usd()
+        ath_date: _Usd = _Usd()
+        atl: _Usd = _Usd()
+        atl_change_percentage: _Usd = _Usd()
+        price_change_percentage_24h: Any = None
+        price_change_percentage_7d: Any = None
+        price_change_percentage_30d: Any = None
+        circulating_supply: Any = None
+        total_supply: Any = None
+        max_supply: Any = None
+
+    class _Repos(msgspec.Struct, frozen=True, omit_defaults=True):
+        github: Any = None
+
+    class _Links(msgspec.Struct, frozen=True, omit_defaults=True):
+        homepage: Any = None
+        twitter_screen_name: Any = None
+        telegram_channel_identifier: Any = None
+        chat_url: Any = None
+        repos_url: _Repos = _Repos()
+
+    class _Community(msgspec.Struct, frozen=True, omit_defaults=True):
+        twitter_followers: Any = None
+        telegram_channel_user_count: Any = None
+
+    class _Description(msgspec.Struct, frozen=True, omit_defaults=True):
+        en: Any = None
+
+    class CoinDocument(msgspec.Struct, omit_defaults=True):
+        id: Any = None
+        name: Any = None
+        symbol: Any = None
+        market_cap_rank: Any = None
+        coingecko_score: Any = None
+        developer_score: Any = None
+        community_score: Any = None
+        liquidity_score: Any = None
+        public_interest_score: Any = None
+        market_data: _MarketData = _MarketData()
+        links: _Links = _Links()
+        community_data: _Community = _Community()
+        description: _Description = _Description()
+else:
+    CoinDocument = None
+
 
 class CoinGeckoClient:
     """Client for fetching additional token data from CoinGecko API"""
     
-    def __init__(self, api_key: Optional[str] = None):
+    def __init__(self, api_key: Optional[str] = None, budget_share: float = 1.0,
+                 rate_limit_delay: float = RATE_LIMIT_DELAY):
         """
         Initialize CoinGecko client
         
         Args:
             api_key: Optional API key for higher rate limits (None works for free)
+            budget_share: Fraction of the rate limit this client may use, when
+                several processes share one key
+            rate_limit_delay: Seconds between calls for the whole key
         """
         if api_key:
             self.cg = CoinGeckoAPI(api_key=api_key)
@@ -22,33 +114,76 @@ class CoinGeckoClient:
             # Works without API key - lower rate limits but FREE
             self.cg = CoinGeckoAPI()
         
-        self.rate_limit_delay = 2.0  # Free tier: ~30 calls/min = 2 sec delay
+        # Record/replay hooks for offline runs (no-op unless enabled)
+        replay.mount_requests(self.cg.session)
+        
+        self.rate_limit_delay = rate_limit_delay / budget_share
+        self.request_timeout = 30
+        # (platform, contract address) -> CoinGecko coin id, learned on first discovery
+        self._coin_ids: Dict[Tuple[str, str], str] = {}
+        # Contract addresses per simple/token_price request
+        self.price_batch_size = 100
+        # Duplicate pairs for one token share a single lookup
+        self._inflight = SingleFlight()
         logger.info("CoinGecko client initialized")
     
-    async def get_token_data(self, solana_address: str) -> Optional[Dict]:
+    async def _get_json(self, path: str, params: Optional[Dict] = None, schema: Optional[type] = None):
+        """
+        GET an API path through pycoingecko's session (same base URL, key
+        params and retries) but decode the body with the fast JSON backend,
+        limited to `schema`'s fields when one is given. The blocking request
+        runs on a worker thread so the event loop keeps serving other chains.
+        """
+        return await asyncio.to_thread(self._get_json_blocking, path, params, schema)
+    
+    def _get_json_blocking(self, path: str, params: Optional[Dict], schema: Optional[type]):
+        params = dict(params or {})
+        if self.cg.extra_params:
+            params.update(self.cg.extra_params)
+        response = self.cg.session.get(f"{self.cg.api_base_url}{path}", params=params, timeout=self.request_timeout)
+        response.raise_for_status()
+        return decode(response.content, schema)
+    
+    async def get_token_data(self, solana_address: str, chain: str = "solana") -> Optional[Dict]:
         """
         Fetch detailed token data from CoinGecko by Solana contract address
         
         Args:
             solana_address: Solana token contract address
+            chain: DexScreener chain id, for contracts on other chains
             
         Returns:
             Dictionary with token data or None if not found
         """
+        platform = CHAIN_PLATFORMS.get(chain)
+        if platform is None:
+            return None
+        return await self._inflight.do((platform, solana_address), self._fetch_token_data, solana_address, platform)
+    
+    def knows(self, address: str, chain: str = "solana") -> bool:
+        """Whether the address already resolved to a CoinGecko coin id"""
+        return (CHAIN_PLATFORMS.get(chain), address) in self._coin_ids
+    
+    async def _fetch_token_data(self, solana_address: str, platform: str = "solana") -> Optional[Dict]:
         try:
             # Rate limit handling
             await asyncio.sleep(self.rate_limit_delay)
             
-            # Fetch token by contract address on Solana network
-            data = self.cg.get_coin_info_from_contract_address_by_id(
-                id='solana',
-                contract_address=solana_address
-            )
+            # First sighting resolves the coin via its contract address; after
+            # that the lighter /coins/{id} variant skips tickers/localization
+            coin_id = self._coin_ids.get((platform, solana_address))
+            if coin_id:
+                data = await self._get_json(f"coins/{coin_id}", LIGHT_COIN_PARAMS, CoinDocument)
+            else:
+                data = await self._get_json(f"coins/{platform}/contract/{solana_address}", schema=CoinDocument)
             
             if not data:
                 logger.debug(f"No CoinGecko data found for {solana_address}")
                 return None
             
+            if data.get('id'):
+                self._coin_ids[(platform, solana_address)] = data['id']
+            
             # Extract market data
             market_data = data.get('market_data', {})
             links = data.get('links', {})
@@ -116,6 +251,64 @@ class CoinGeckoClient:
             logger.error(f"Error fetching CoinGecko data for {solana_address}: {e}")
             return None
     
+    def tracked_addresses(self, chain: str = "solana") -> List[str]:
+        """Contract addresses on `chain` already discovered on CoinGecko"""
+        platform = CHAIN_PLATFORMS.get(chain)
+        return [address for p, address in self._coin_ids if p == platform]
+    
+    async def refresh_prices(self, addresses: Optional[List[str]] = None, chain: str = "solana") -> Dict[str, Dict]:
+        """
+        Refresh price, market cap and 24h volume for many tokens at once via
+        simple/token_price/{platform}, instead of one coin document per address
+        
+        Args:
+            addresses: Contract addresses (default: all tracked_addresses(chain))
+            chain: DexScreener chain id of the addresses
+            
+        Returns:
+            Dictionary of address -> price fields; addresses CoinGecko does
+            not know are left out
+        """
+        platform = CHAIN_PLATFORMS.get(chain)
+        if platform is None:
+            return {}
+        if addresses is None:
+            addresses = self.tracked_addresses(chain)
+        results: Dict[str, Dict] = {}
+        
+        for i in range(0, len(addresses), self.price_batch_size):
+            chunk = addresses[i:i + self.price_batch_size]
+            try:
+                await asyncio.sleep(self.rate_limit_delay)
+                data = await self._get_json(f"simple/token_price/{platform}", {
+                    'contract_addresses': ','.join(chunk),
+                    'vs_currencies': 'usd',
+                    'include_market_cap': 'true',
+                    'include_24hr_vol': 'true',
+                    'include_24hr_change': 'true',
+                    'include_last_updated_at': 'true',
+                })
+            except Exception as e:
+                logger.error(f"Error refreshing CoinGecko prices for {len(chunk)} tokens: {e}")
+                continue
+            
+            # Keys may come back lowercased; map them to the caller's spelling
+            by_lower = {a.lower(): a for a in chunk}
+            for key, quote in (data or {}).items():
+                address = by_lower.get(key.lower())
+                if address is None:
+                    continue
+                results[address] = {
+                    'price_usd': quote.get('usd'),
+                    'market_cap': quote.get('usd_market_cap'),
+                    'volume_24h': quote.get('usd_24h_vol'),
+                    'price_change_24h': quote.get('usd_24h_change'),
+                    'last_updated_at': quote.get('last_updated_at'),
+                }
+        
+        logger.info(f"Refreshed CoinGecko prices for {len(results)}/{len(addresses)} tokens")
+        return results
+    
     async def get_trending_tokens(self) -> Optional[List[Dict]]:
         """
         Fetch currently trending tokens from CoinGecko
@@ -181,8 +374,14 @@ if __name__ == "__main__":
         else:
             print("   ❌ No data returned")
         
-        # Test 3: Trending tokens
-        print("\n3. Testing trending tokens...")
+        # Test 3: Batch price refresh for everything discovered so far
+        print("\n3. Testing batch price refresh...")
+        prices = await client.refresh_prices()
+        for address, quote in prices.items():
+            print(f"   {address[:8]}... ${quote['price_usd']}")
+        
+        # Test 4: Trending tokens
+        print("\n4. Testing trending tokens...")
         trending = await client.get_trending_tokens()
         if trending:
             print(f"   Top 3 trending:")
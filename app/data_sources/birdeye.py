@@ -1,43 +1,97 @@
-import httpx
+import os
+import time
+import asyncio
 import yaml
+from functools import lru_cache
 from ..schemas import HolderStats, CodeRisk
+from ..http_client import make_async_client
+from ..ratelimit import AsyncRateLimiter
+from ..fastjson import loads
+from ..singleflight import SingleFlight
+
+BIRDEYE_API = "https://public-api.birdeye.so"
+
+# Defaults sized for the Birdeye Standard plan; override under
+# data_sources.birdeye in config.yaml to match your plan
+DEFAULT_REQUESTS_PER_SECOND = 15
+DEFAULT_MAX_CONCURRENCY = 5
+DEFAULT_CACHE_TTL_SECONDS = 600
+
+
+@lru_cache(maxsize=None)
+def _load_birdeye_config(config_path: str) -> dict:
+    """Read the birdeye section of config.yaml once per path"""
+    with open(config_path) as f:
+        return yaml.safe_load(f)['data_sources']['birdeye']
+
 
 class BirdeyeSource:
-    def __init__(self, config_path='config.yaml'):  # FIXED PATH
-        with open(config_path) as f:
-            cfg = yaml.safe_load(f)['data_sources']['birdeye']
-        self.api_key = cfg['api_key']
+    def __init__(self, config_path='config.yaml', budget_share: float = 1.0):  # FIXED PATH
+        cfg = _load_birdeye_config(str(config_path))
+        self.api_key = os.path.expandvars(cfg.get('api_key') or '')
         self.headers = {"x-api-key": self.api_key, "x-chain": "solana"}
-    
+        # budget_share < 1 when several processes spend one API key
+        self.max_concurrency = max(1, int(int(cfg.get('max_concurrency', DEFAULT_MAX_CONCURRENCY)) * budget_share))
+        rate = float(cfg.get('requests_per_second', DEFAULT_REQUESTS_PER_SECOND)) * budget_share
+        self.limiter = AsyncRateLimiter(rate=rate, burst=max(1.0, rate), max_concurrency=self.max_concurrency)
+        self.cache_ttl = float(cfg.get('cache_ttl_seconds', DEFAULT_CACHE_TTL_SECONDS))
+        self._cache = {}
+        self._inflight = SingleFlight()
+        self._client = None
+
+    def _get_client(self):
+        # One long-lived pooled client instead of one per token
+        if self._client is None:
+            self._client = make_async_client(
+                timeout=20, max_connections=self.max_concurrency, headers=self.headers
+            )
+        return self._client
+
+    async def aclose(self):
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    async def _get_data(self, path: str, default):
+        async with self.limiter:
+            r = await self._get_client().get(f"{BIRDEYE_API}{path}")
+        # 429/5xx bodies are error envelopes, not data
+        r.raise_for_status()
+        return loads(r.content).get("data") or default
+
     async def enrich_with_birdeye(self, token_address: str):
-        async with httpx.AsyncClient(timeout=20) as client:
+        cached = self._cache.get(token_address)
+        if cached and time.monotonic() - cached[0] < self.cache_ttl:
+            return cached[1]
+        return await self._inflight.do(token_address, self._fetch, token_address)
+
+    async def _fetch(self, token_address: str):
+        # holder_list and security are independent: issue them together
+        holders_data, sec = await asyncio.gather(
+            self._get_data(f"/defi/token/holder_list?address={token_address}&limit=100", []),
+            self._get_data(f"/defi/token/security?address={token_address}", {}),
+            return_exceptions=True,
+        )
+        if isinstance(holders_data, Exception):
             holders_data = []
-            try:
-                h = await client.get(
-                    f"https://public-api.birdeye.so/defi/token/holder_list?address={token_address}&limit=100",
-                    headers=self.headers
-                )
-                holders_data = h.json().get("data", [])
-            except:
-                pass
-            
-            holder_count = len(holders_data)
-            top1_pct = top5_pct = 0.0
-            if holders_data:
-                balances = [float(x.get("amount", 0)) for x in holders_data[:5]]
-                total = sum(balances) or 1
-                top1_pct = max(balances) / total * 100 if balances else 0
-                top5_pct = total / total * 100
-            
-            sec = {"mintAuthorityDisabled": True}
-            try:
-                s = await client.get(
-                    f"https://public-api.birdeye.so/defi/token/security?address={token_address}",
-                    headers=self.headers
-                )
-                sec = s.json().get("data", {})
-            except:
-                pass
-            
-        return HolderStats(holder_count=holder_count, top1_pct=top1_pct, top5_pct=top5_pct), \
-               CodeRisk(sol_mint_authority_revoked=sec.get("mintAuthorityDisabled"))
+        # Without a security answer the mint authority counts as live
+        sec_failed = isinstance(sec, Exception)
+        if sec_failed:
+            sec = {}
+
+        holder_count = len(holders_data)
+        top1_pct = top5_pct = 0.0
+        if holders_data:
+            # Shares of the balance held by the returned (top 100) holders
+            balances = sorted((float(x.get("amount", 0)) for x in holders_data), reverse=True)
+            total = sum(balances) or 1
+            top1_pct = balances[0] / total * 100
+            top5_pct = sum(balances[:5]) / total * 100
+
+        result = (
+            HolderStats(holder_count=holder_count, top1_pct=top1_pct, top5_pct=top5_pct),
+            CodeRisk(mint_revoked=sec.get("mintAuthorityDisabled") is True),
+        )
+        if holder_count and not sec_failed:
+            self._cache[token_address] = (time.monotonic(), result)
+        return result
@@ -1,9 +1,54 @@
 import time
 import asyncio
+import hashlib
 import httpx
-from typing import List, Optional
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from typing import Dict, List, Optional, Tuple
 
-from ..schemas import TokenInfo, LiquidityInfo, VolumeInfo, FiltersConfig
+from ..schemas import TokenInfo, FiltersConfig
+from ..records import TokenRecord
+from ..fastjson import loads
+from ..http_client import make_async_client
+from ..ratelimit import AsyncRateLimiter
+
+TOKENS_URL = "https://api.dexscreener.com/latest/dex/tokens/"
+# The tokens endpoint accepts up to 30 comma-separated addresses
+MAX_TOKENS_PER_REQUEST = 30
+
+# DexScreener allows 300 requests/min per IP on the search, pair and token
+# endpoints. Every request spends a token of that shared budget; each chain
+# also has its own limiter so one busy chain cannot starve the others.
+IP_REQUESTS_PER_SECOND = 5
+CHAIN_REQUESTS_PER_SECOND = 5
+CHAIN_MAX_CONCURRENCY = 8
+# This process's fraction of the budget when several processes share one IP
+_budget_share = 1.0
+_ip_limiter: Optional[AsyncRateLimiter] = None
+_limiters: Dict[str, AsyncRateLimiter] = {}
+_client: Optional[httpx.AsyncClient] = None
+
+# Running totals, overall and per chain; each chain's scheduler reads its
+# own to spot throttling
+request_stats = {"requests": 0, "throttled": 0, "not_modified": 0}
+chain_request_stats: Dict[str, Dict[str, int]] = {}
+
+
+def _count(chain: str, stat: str) -> None:
+    request_stats[stat] += 1
+    per_chain = chain_request_stats.setdefault(chain, {"requests": 0, "throttled": 0, "not_modified": 0})
+    per_chain[stat] += 1
+
+# Per (chain, search URL): last ETag and body digest, so repeated searches
+# can skip re-downloading (304) or re-decoding (same bytes)
+_response_etags: Dict[Tuple[str, str], str] = {}
+_response_digests: Dict[Tuple[str, str], bytes] = {}
+# pairAddress -> market fingerprint from the last scan that settled the pair
+MAX_PAIR_FINGERPRINTS = 50_000
+_pair_fingerprints: "OrderedDict[str, Tuple]" = OrderedDict()
+# chain -> {pairAddress: pair} still too young for the age filter; offered
+# again on every scan until they are old enough to get a verdict
+_pending_pairs: Dict[str, Dict[str, dict]] = {}
 
 
 async def fetch_new_listings(
@@ -12,19 +57,163 @@ async def fetch_new_listings(
     max_age_minutes: int = 720
 ) -> List[TokenInfo]:
     """
-    Fetch new token listings from DexScreener using search.
+    Fetch new token listings from DexScreener as TokenInfo models.
+    The scan loop uses fetch_search_pairs + parse_pair_records instead.
+    """
+    unique_pairs = await fetch_search_pairs(chain)
+    if not unique_pairs:
+        return []
+
+    tokens = parse_pairs(unique_pairs, chain, cfg, max_age_minutes)
+
+    print(f"[debug] {len(tokens)} live {chain} pairs accepted after filtering")
+    
+    # Sort by age (newest first)
+    tokens.sort(key=lambda t: t.age_minutes)
+    
+    return tokens
+
+
+# Default keyword searches per chain; each returns ~30 pairs
+DEFAULT_SEARCH_QUERIES = {
+    "solana": ["raydium", "orca", "solana new", "pump.fun"],
+    "ethereum": ["uniswap", "ethereum new"],
+    "bsc": ["pancakeswap", "bsc new"],
+    "base": ["aerodrome", "base new"],
+}
+
+
+def get_limiter(chain: str) -> AsyncRateLimiter:
+    """The chain's own DexScreener request budget"""
+    if chain not in _limiters:
+        _limiters[chain] = AsyncRateLimiter(
+            rate=CHAIN_REQUESTS_PER_SECOND * _budget_share,
+            burst=max(1.0, CHAIN_REQUESTS_PER_SECOND * _budget_share),
+            max_concurrency=max(1, int(CHAIN_MAX_CONCURRENCY * _budget_share)),
+        )
+    return _limiters[chain]
+
+
+def get_ip_limiter() -> AsyncRateLimiter:
+    """The per-IP DexScreener budget every chain draws from"""
+    global _ip_limiter
+    if _ip_limiter is None:
+        _ip_limiter = AsyncRateLimiter(rate=IP_REQUESTS_PER_SECOND * _budget_share,
+                                       burst=max(1.0, IP_REQUESTS_PER_SECOND * _budget_share))
+    return _ip_limiter
+
+
+@asynccontextmanager
+async def _request_slot(chain: str):
+    """A place under the chain's limiter plus one token of the IP budget"""
+    async with get_limiter(chain):
+        await get_ip_limiter().wait()
+        yield
+
+
+def set_budget_share(share: float) -> None:
+    """Scale this process's DexScreener budgets (see sharding.ShardPool)"""
+    global _budget_share, _ip_limiter
+    _budget_share = share
+    _ip_limiter = None
+    _limiters.clear()
+
+
+def _pair_fingerprint(p: dict) -> Tuple:
+    liquidity = p.get("liquidity") or {}
+    volume = p.get("volume") or {}
+    m5 = (p.get("txns") or {}).get("m5") or {}
+    return (p.get("priceUsd"), liquidity.get("usd"), volume.get("h1"), volume.get("h24"),
+            m5.get("buys"), m5.get("sells"), p.get("fdv"))
+
+
+def changed_pairs(pairs: List[dict]) -> List[dict]:
+    """
+    Keep pairs that are new or whose market fields moved since a scan last
+    settled them (see settle_pairs); unchanged pairs already had their turn
+    """
+    return [p for p in pairs if _pair_fingerprints.get(p.get("pairAddress")) != _pair_fingerprint(p)]
+
+
+def settle_pairs(chain: str, pairs: List[dict], min_age_minutes: int = 0, now_ms: Optional[int] = None) -> None:
+    """
+    Record that a scan reached a verdict on `pairs`, so unchanged repeats
+    are skipped from now on. Pairs younger than min_age_minutes were only
+    rejected for their age: they stay pending instead and are returned by
+    the next changed_only search even if nothing about them changed.
+    """
+    if now_ms is None:
+        now_ms = int(time.time() * 1000)
+    cutoff_ms = now_ms - min_age_minutes * 60_000
+    pending = {}
+    for p in pairs:
+        pair_address = p.get("pairAddress")
+        if not pair_address:
+            continue
+        if min_age_minutes > 0 and int(p.get("pairCreatedAt") or 0) > cutoff_ms:
+            pending[pair_address] = p
+            continue
+        _pair_fingerprints[pair_address] = _pair_fingerprint(p)
+        _pair_fingerprints.move_to_end(pair_address)
+    _pending_pairs[chain] = pending
+    while len(_pair_fingerprints) > MAX_PAIR_FINGERPRINTS:
+        _pair_fingerprints.popitem(last=False)
+
+
+def forget_search_responses(chain: str) -> None:
+    """After a failed scan: download and decode this chain's searches in full next time"""
+    for store in (_response_etags, _response_digests):
+        for key in [k for k in store if k[0] == chain]:
+            del store[key]
+
+
+async def _get_body(url: str, chain: str, conditional: bool = False) -> Optional[bytes]:
+    """
+    GET a URL's body under the chain's limiter. With conditional, returns
+    None when the server answers 304 or the body hashes the same as the
+    last time this chain asked.
+    """
+    key = (chain, url)
+    headers = {}
+    if conditional and key in _response_etags:
+        headers["If-None-Match"] = _response_etags[key]
+    async with _request_slot(chain):
+        _count(chain, "requests")
+        r = await _get_client().get(url, headers=headers)
+    if r.status_code == 429:
+        _count(chain, "throttled")
+    if r.status_code == 304:
+        _count(chain, "not_modified")
+        return None
+    r.raise_for_status()
+    if not conditional:
+        return r.content
+    
+    if r.headers.get("etag"):
+        _response_etags[key] = r.headers["etag"]
+    digest = hashlib.blake2b(r.content, digest_size=16).digest()
+    if _response_digests.get(key) == digest:
+        _count(chain, "not_modified")
+        return None
+    _response_digests[key] = digest
+    return r.content
+
+
+async def fetch_search_pairs(chain: str = "solana", queries: Optional[List[str]] = None,
+                             changed_only: bool = False) -> List[dict]:
+    """
+    Fetch raw, de-duplicated pair dicts from DexScreener using search.
     Search endpoint returns up to 30 most relevant pairs per query.
     We search multiple queries to get more coverage.
+    
+    With changed_only, searches whose response is unchanged since the last
+    call are not decoded at all, and of the rest only new or changed pairs
+    (see changed_pairs) are returned, plus the pairs still pending their
+    age (see settle_pairs).
     """
     
-    # Use search to find new Solana tokens
-    # Multiple queries to get better coverage (each returns ~30 pairs)
-    search_queries = [
-        "raydium",
-        "orca", 
-        "solana new",
-        "pump.fun",
-    ]
+    # Use search to find new tokens on this chain
+    search_queries = DEFAULT_SEARCH_QUERIES.get(chain, [chain]) if queries is None else queries
     
     all_pairs = []
     
@@ -32,27 +221,25 @@ async def fetch_new_listings(
         url = f"https://api.dexscreener.com/latest/dex/search?q={query}"
         
         try:
-            async with httpx.AsyncClient(timeout=30) as client:
-                r = await client.get(url)
-                r.raise_for_status()
-                data = r.json()
+            content = await _get_body(url, chain, conditional=changed_only)
+            if content is None:
+                print(f"[debug] Search results unchanged for query '{query}'")
+            else:
+                data = loads(content)
                 
                 pairs = data.get("pairs", [])
-                # Filter for Solana only
-                solana_pairs = [p for p in pairs if p.get("chainId") == "solana"]
-                all_pairs.extend(solana_pairs)
-                
-                print(f"[debug] Found {len(solana_pairs)} Solana pairs for query '{query}'")
+                # Search is cross-chain: keep this chain's pairs only
+                chain_pairs = [p for p in pairs if p.get("chainId") == chain]
+                all_pairs.extend(chain_pairs)
                 
+                print(f"[debug] Found {len(chain_pairs)} {chain} pairs for query '{query}'")
+            
         except httpx.HTTPStatusError as e:
             print(f"[error] DexScreener HTTP error for '{query}': {e.response.status_code}")
             continue
         except Exception as e:
             print(f"[error] DexScreener request failed for '{query}': {e}")
             continue
-        
-        # Small delay to avoid rate limiting
-        await asyncio.sleep(0.5)
     
     # Remove duplicates based on pair address
     seen_addresses = set()
@@ -63,16 +250,120 @@ async def fetch_new_listings(
             seen_addresses.add(pair_address)
             unique_pairs.append(p)
     
-    print(f"[debug] Total unique Solana pairs found: {len(unique_pairs)}")
+    print(f"[debug] Total unique {chain} pairs found: {len(unique_pairs)}")
 
-    if not unique_pairs:
+    if not unique_pairs and not changed_only:
         print("[warning] No pairs returned from DexScreener")
-        return []
+    
+    if changed_only:
+        unique_pairs = changed_pairs(unique_pairs)
+        print(f"[debug] {len(unique_pairs)} new or changed {chain} pairs since last scan")
+        fresh = {p.get("pairAddress") for p in unique_pairs}
+        unique_pairs += [p for a, p in _pending_pairs.get(chain, {}).items() if a not in fresh]
+
+    return unique_pairs
+
+
+def _get_client() -> httpx.AsyncClient:
+    # Pooled client shared by searches and the batched token refresh
+    global _client
+    if _client is None:
+        # Room for a few chains at their full in-flight cap
+        _client = make_async_client(timeout=30, max_connections=CHAIN_MAX_CONCURRENCY * 4)
+    return _client
+
+
+async def aclose() -> None:
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+
+
+async def _fetch_token_chunk(chunk: List[str], chain: str) -> List[dict]:
+    try:
+        async with _request_slot(chain):
+            _count(chain, "requests")
+            r = await _get_client().get(TOKENS_URL + ",".join(chunk))
+        if r.status_code == 429:
+            _count(chain, "throttled")
+        r.raise_for_status()
+        pairs = loads(r.content).get("pairs") or []
+        return [p for p in pairs if p.get("chainId") == chain]
+    except httpx.HTTPStatusError as e:
+        print(f"[error] DexScreener HTTP error for {len(chunk)} tokens: {e.response.status_code}")
+    except Exception as e:
+        print(f"[error] DexScreener token refresh failed for {len(chunk)} tokens: {e}")
+    return []
+
+
+async def fetch_pairs_by_tokens(addresses: List[str], chain: str = "solana") -> Dict[str, TokenRecord]:
+    """
+    Fetch current snapshots for known token addresses through the
+    multi-address tokens/{a,b,c} endpoint. Addresses go out in chunks of
+    MAX_TOKENS_PER_REQUEST, concurrently under the chain's DexScreener limiter
+    and the per-IP budget.
+    
+    Returns address -> TokenRecord built from the token's deepest pool;
+    addresses without a live pair are left out.
+    """
+    wanted = set(addresses)
+    snapshots: Dict[str, TokenRecord] = {}
+    # Snapshots are for tracking, so no age cut-off here
+    for r in parse_pair_records(await fetch_token_pairs(addresses, chain), chain, max_age_minutes=10 ** 9):
+        if r.address in wanted and (
+                r.address not in snapshots or r.liquidity_usd > snapshots[r.address].liquidity_usd):
+            snapshots[r.address] = r
+    
+    return snapshots
+
+
+async def fetch_token_pairs(addresses: List[str], chain: str = "solana") -> List[dict]:
+    """
+    Raw pair dicts for token addresses, MAX_TOKENS_PER_REQUEST per request,
+    chunks fetched concurrently under the chain's limiter
+    """
+    unique = list(dict.fromkeys(addresses))
+    chunks = [unique[i:i + MAX_TOKENS_PER_REQUEST] for i in range(0, len(unique), MAX_TOKENS_PER_REQUEST)]
+    results = await asyncio.gather(*(_fetch_token_chunk(c, chain) for c in chunks))
+    return [p for pairs in results for p in pairs]
+
+
+def parse_pairs(
+    pairs: List[dict],
+    chain: str = "solana",
+    cfg: Optional[FiltersConfig] = None,
+    max_age_minutes: int = 720,
+    now_ms: Optional[int] = None,
+) -> List[TokenInfo]:
+    """
+    Turn raw DexScreener pair dicts into TokenInfo objects.
+    Models are only built for pairs that survive parse_pair_records, and
+    with model_construct since every field is already converted there.
+    """
+    return [r.to_token_info() for r in parse_pair_records(pairs, chain, cfg, max_age_minutes, now_ms)]
+
 
-    now_ms = int(time.time() * 1000)
-    tokens: List[TokenInfo] = []
+def parse_pair_records(
+    pairs: List[dict],
+    chain: str = "solana",
+    cfg: Optional[FiltersConfig] = None,
+    max_age_minutes: int = 720,
+    now_ms: Optional[int] = None,
+) -> List[TokenRecord]:
+    """
+    Turn raw DexScreener pair dicts into compact TokenRecords.
+    Cheap checks (age, liquidity, price, address) run on the raw dict first,
+    so records are only allocated for survivors.
+    """
+    if now_ms is None:
+        now_ms = int(time.time() * 1000)
+    if cfg:
+        min_liq, max_liq = cfg.min_liquidity_usd, cfg.max_liquidity_usd
+        min_price, max_price = cfg.min_price_usd, cfg.max_price_usd
 
-    for p in unique_pairs:
+    records: List[TokenRecord] = []
+    for p in pairs:
         # Check pair creation time
         created_ms = p.get("pairCreatedAt")
         if not created_ms:
@@ -84,61 +375,42 @@ async def fetch_new_listings(
             continue
 
         # Extract liquidity info
-        liquidity_data = p.get("liquidity", {})
-        liquidity = float(liquidity_data.get("usd", 0))
-        
+        liquidity = float((p.get("liquidity") or {}).get("usd") or 0)
         if liquidity <= 0:
             continue
-
-        # Extract volume and price
-        volume_data = p.get("volume", {})
-        volume_1h = float(volume_data.get("h1", 0))
         price_usd = float(p.get("priceUsd") or 0)
-        fdv_usd = float(p.get("fdv") or 0)
 
-        # Extract transaction data (5 minute window)
-        txns_5m = p.get("txns", {}).get("m5", {})
-        if not txns_5m:
-            txns_5m = p.get("txns", {}).get("h1", {})  # Fallback to 1 hour
-        
-        trades_5m = int(txns_5m.get("buys", 0)) + int(txns_5m.get("sells", 0))
+        # Apply filters if provided
+        if cfg:
+            if not (min_liq <= liquidity <= max_liq):
+                continue
+            if not (min_price <= price_usd <= max_price):
+                continue
 
         # Extract base token info
-        base = p.get("baseToken", {})
-        symbol = base.get("symbol", "UNKNOWN")
+        base = p.get("baseToken") or {}
         address = base.get("address", "")
-        
         if not address:
             continue
 
-        # Create token object
-        token = TokenInfo(
-            symbol=symbol,
+        # Extract transaction data (5 minute window, fallback to 1 hour)
+        txns = p.get("txns") or {}
+        txns_5m = txns.get("m5") or txns.get("h1") or {}
+        trades_5m = int(txns_5m.get("buys", 0)) + int(txns_5m.get("sells", 0))
+
+        volume = p.get("volume") or {}
+        records.append(TokenRecord(
+            symbol=base.get("symbol") or "UNKNOWN",
+            name=base.get("name"),
             chain=chain,
             address=address,
             price_usd=price_usd,
-            liquidity=LiquidityInfo(usd=liquidity),
-            volume=VolumeInfo(usd_1h=volume_1h),
+            liquidity_usd=liquidity,
+            volume_1h_usd=float(volume.get("h1") or 0),
+            volume_24h_usd=float(volume.get("h24") or 0),
             age_minutes=age_m,
-            fdv_usd=fdv_usd,
-            dex_trades_5m=trades_5m
-        )
-
-        # Apply filters if provided
-        if cfg:
-            # Liquidity filter
-            if not (cfg.min_liquidity_usd <= liquidity <= cfg.max_liquidity_usd):
-                continue
-            
-            # Price filter
-            if not (cfg.min_price_usd <= price_usd <= cfg.max_price_usd):
-                continue
+            fdv_usd=float(p.get("fdv") or 0),
+            dex_trades_5m=trades_5m,
+        ))
 
-        tokens.append(token)
-
-    print(f"[debug] {len(tokens)} live {chain} pairs accepted after filtering")
-    
-    # Sort by age (newest first)
-    tokens.sort(key=lambda t: t.age_minutes)
-    
-    return tokens
+    return records
@@ -0,0 +1,132 @@
+"""
+Incremental new-listing discovery from DexScreener's profile/boost feeds
+The feeds list the most recently profiled/boosted tokens, newest first.
+Each poll only emits what is above the previous poll's head (the feed's
+high-water mark); the addresses are then resolved in batches through
+fetch_token_pairs. The feeds are cross-chain, so one poll serves every
+scanned chain.
+"""
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import httpx
+
+from ..fastjson import loads
+from ..http_client import make_async_client
+from ..ratelimit import AsyncRateLimiter
+from .dexscreener import fetch_token_pairs, request_stats
+
+FEEDS = {
+    "profiles": "https://api.dexscreener.com/token-profiles/latest/v1",
+    "boosts": "https://api.dexscreener.com/token-boosts/latest/v1",
+}
+
+# The feed endpoints are limited to 60 requests/min
+FEED_REQUESTS_PER_SECOND = 1
+
+
+def _item_key(item: dict) -> Tuple:
+    # A token can be boosted again; the running total tells the boosts apart
+    return (item.get("chainId"), item.get("tokenAddress"), item.get("totalAmount"))
+
+
+class FeedDiscovery:
+    """Polls the DexScreener listing feeds for addresses not seen before"""
+
+    def __init__(self, chains: Iterable[str] = ("solana",), feeds: Optional[Dict[str, str]] = None,
+                 max_seen: int = 50_000):
+        self.chains = list(chains)
+        self.feeds = dict(FEEDS if feeds is None else feeds)
+        self.max_seen = max_seen
+        self.limiter = AsyncRateLimiter(rate=FEED_REQUESTS_PER_SECOND, burst=len(self.feeds))
+        # Per-feed head key from the previous poll
+        self.high_water: Dict[str, Tuple] = {}
+        # (chain, address) already emitted, oldest evicted first
+        self._seen: "OrderedDict[Tuple[str, str], None]" = OrderedDict()
+        # Emitted while too young for the age filter; re-emitted next poll
+        self._pending: Dict[str, List[str]] = {}
+        self._client: Optional[httpx.AsyncClient] = None
+
+    def _get_client(self) -> httpx.AsyncClient:
+        if self._client is None:
+            self._client = make_async_client(timeout=20, max_connections=len(self.feeds))
+        return self._client
+
+    async def aclose(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    async def _fetch_feed(self, name: str) -> List[dict]:
+        try:
+            async with self.limiter:
+                request_stats["requests"] += 1
+                r = await self._get_client().get(self.feeds[name])
+            if r.status_code == 429:
+                request_stats["throttled"] += 1
+            r.raise_for_status()
+            items = loads(r.content)
+            return items if isinstance(items, list) else []
+        except Exception as e:
+            print(f"[error] DexScreener {name} feed failed: {e}")
+            return []
+
+    def _new_items(self, name: str, items: List[dict]) -> List[dict]:
+        """Items above the previous head; everything if the head scrolled off"""
+        if not items:
+            return []
+        head = self.high_water.get(name)
+        self.high_water[name] = _item_key(items[0])
+        fresh = []
+        for item in items:
+            if _item_key(item) == head:
+                break
+            fresh.append(item)
+        return fresh
+
+    async def poll(self) -> Dict[str, List[str]]:
+        """New token addresses per scanned chain across all feeds"""
+        found = {chain: list(self._pending.get(chain, [])) for chain in self.chains}
+        self._pending = {}
+        feeds = await asyncio.gather(*(self._fetch_feed(name) for name in self.feeds))
+        for name, items in zip(self.feeds, feeds):
+            for item in self._new_items(name, items):
+                chain, address = item.get("chainId"), item.get("tokenAddress")
+                if chain not in found or not address or (chain, address) in self._seen:
+                    continue
+                self._seen[(chain, address)] = None
+                found[chain].append(address)
+
+        while len(self._seen) > self.max_seen:
+            self._seen.popitem(last=False)
+
+        for chain, addresses in found.items():
+            if addresses:
+                print(f"[debug] {len(addresses)} new {chain} tokens from DexScreener feeds")
+        return found
+
+    async def poll_pairs(self, min_age_minutes: int = 0) -> Dict[str, List[dict]]:
+        """
+        poll() resolved to raw pair dicts in multi-address batches, all
+        chains concurrently. Tokens whose pairs are all younger than
+        min_age_minutes are returned now and again on later polls until they
+        are old enough, since the feeds will not list them twice.
+        """
+        found = {chain: addresses for chain, addresses in (await self.poll()).items() if addresses}
+        resolved = await asyncio.gather(*(fetch_token_pairs(a, chain) for chain, a in found.items()))
+        pairs_by_chain = dict(zip(found, resolved))
+
+        if min_age_minutes > 0:
+            cutoff_ms = int(time.time() * 1000) - min_age_minutes * 60_000
+            for chain, pairs in pairs_by_chain.items():
+                old_enough = {
+                    (p.get("baseToken") or {}).get("address")
+                    for p in pairs if int(p.get("pairCreatedAt") or 0) <= cutoff_ms
+                }
+                listed = {(p.get("baseToken") or {}).get("address") for p in pairs}
+                young = [a for a in found[chain] if a in listed and a not in old_enough]
+                if young:
+                    self._pending[chain] = young
+        return pairs_by_chain
@@ -1,34 +1,118 @@
 """
 Ethereum Smart Contract Security Scanner
 Multi-layer detection: Web3.py + GoPlus API + Etherscan
+
+Nothing heavy happens at import time: config.yaml, the Web3 provider and the
+scanner singleton are built on first use so Solana-only runs and the
+dashboard never pay for them.
 """
-from web3 import Web3
 import os
-import requests
-from typing import Dict, List
+import asyncio
+from collections import OrderedDict
+from typing import Dict, List, Optional
 import yaml
 from dotenv import load_dotenv
+from app import replay
+from app.fastjson import loads
+from app.singleflight import SingleFlight
 
 load_dotenv()
 
-# Load config from parent directory
+# Config lives in the parent directory
 config_path = os.path.join(os.path.dirname(__file__), '..', 'config.yaml')
-with open(config_path, 'r') as f:
-    config = yaml.safe_load(f)
 
 ALCHEMY_URL = os.getenv('ALCHEMY_API_KEY')
 ETHERSCAN_API = os.getenv('ETHERSCAN_API_KEY', '')
 
-# Initialize Web3
-w3 = Web3(Web3.HTTPProvider(ALCHEMY_URL))
+GOPLUS_URL = "https://api.gopluslabs.io/api/v1/token_security/1?contract_addresses={address}"
+ETHERSCAN_URL = "https://api.etherscan.io/api?module=contract&action=getsourcecode&address={address}&apikey={apikey}"
+
+_config: Optional[Dict] = None
+_w3 = None
+_async_w3 = None
+
+
+def get_config() -> Dict:
+    """Load config.yaml once, on first use"""
+    global _config
+    if _config is None:
+        with open(config_path, 'r') as f:
+            _config = yaml.safe_load(f) or {}
+    return _config
+
+
+def get_web3():
+    """Build the Web3 HTTP provider on first use (web3 is slow to import)"""
+    global _w3
+    if _w3 is None:
+        from web3 import Web3
+        _w3 = Web3(Web3.HTTPProvider(ALCHEMY_URL))
+    return _w3
+
+
+def get_async_web3():
+    """Async counterpart of get_web3() for the event-loop scanner"""
+    global _async_w3
+    if _async_w3 is None:
+        from web3 import AsyncWeb3
+        _async_w3 = AsyncWeb3(AsyncWeb3.AsyncHTTPProvider(ALCHEMY_URL))
+    return _async_w3
+
+
+# GoPlus fields that depend only on the runtime bytecode. Clones of the same
+# template share them, so the first verdict per code hash is laid over later
+# scans. Honeypot, taxes, holders, ownership and verification belong to the
+# deployed address and are fetched on every scan.
+CODE_LEVEL_FIELDS = (
+    'selfdestruct',
+    'hidden_owner',
+    'is_mintable',
+    'is_proxy',
+)
+
+
+class BytecodeVerdictCache:
+    """LRU cache of code-level analysis keyed by keccak(runtime bytecode)"""
+
+    def __init__(self, max_entries: int = 5000):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Dict]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, code_hash: str) -> Optional[Dict]:
+        entry = self._entries.get(code_hash)
+        if entry is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(code_hash)
+        self.hits += 1
+        return entry
+
+    def put(self, code_hash: str, goplus_data: Dict) -> None:
+        self._entries[code_hash] = {
+            'code_flags': {k: goplus_data[k] for k in CODE_LEVEL_FIELDS if k in goplus_data},
+        }
+        self._entries.move_to_end(code_hash)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+
+bytecode_cache = BytecodeVerdictCache()
 
 
 class EthereumScanner:
     """Ethereum contract scanner - mirrors your Solana scanner architecture"""
     
-    def __init__(self):
-        self.w3 = w3
-        self.goplus_enabled = config.get('goplus', {}).get('enabled', True)
+    def __init__(self, cache: Optional[BytecodeVerdictCache] = None):
+        # web3 RPC, GoPlus and Etherscan calls are not taped
+        replay.check_untaped("The Ethereum scanner")
+        self.w3 = get_web3()
+        self.goplus_enabled = get_config().get('goplus', {}).get('enabled', True)
+        self.cache = cache if cache is not None else bytecode_cache
+        self._client = None
+        # Concurrent scans of one address share the GoPlus/Etherscan calls
+        self._inflight = SingleFlight()
     
     def scan_contract(self, address: str) -> Dict:
         """Main scanning function - returns unified risk assessment"""
@@ -42,29 +126,48 @@ class EthereumScanner:
             if not is_contract:
                 return self._wallet_response(checksum_address)
             
+            # Identical bytecode (cloned templates) shares the code-level verdict
+            code_hash = self.w3.keccak(code).hex()
+            cached = self.cache.get(code_hash)
+            
             # Multi-layer security analysis
-            goplus_data = self._scan_with_goplus(checksum_address)
+            goplus_data = self._with_code_flags(self._scan_with_goplus(checksum_address), cached)
             is_verified = self._check_verification(checksum_address)
             
-            # Calculate risk score (0-100)
-            risk_score = self._calculate_risk_score(goplus_data, is_verified, len(code.hex()))
-            flags = self._build_flags(goplus_data, is_verified)
-            verdict = self._get_verdict(risk_score)
+            return self._assess(checksum_address, code, code_hash, cached, goplus_data, is_verified)
             
+        except Exception as e:
             return {
+                'error': str(e),
                 'chain': 'ethereum',
-                'address': checksum_address,
-                'is_contract': True,
-                'risk_score': risk_score,
-                'verdict': verdict,
-                'checks': {
-                    'bytecode_length': len(code.hex()),
-                    'verified': is_verified,
-                    'goplus_data': goplus_data
-                },
-                'flags': flags,
-                'recommendations': self._get_recommendations(risk_score)
+                'address': address
             }
+    
+    async def scan_contract_async(self, address: str) -> Dict:
+        """
+        Non-blocking scan_contract: GoPlus and Etherscan run concurrently over
+        a pooled client, so latency is the slower of the two, not their sum
+        """
+        return await self._inflight.do(address.lower(), self._scan_contract_async, address)
+    
+    async def _scan_contract_async(self, address: str) -> Dict:
+        try:
+            checksum_address = self.w3.to_checksum_address(address)
+            
+            code = await get_async_web3().eth.get_code(checksum_address)
+            if len(code) == 0:
+                return self._wallet_response(checksum_address)
+            
+            code_hash = self.w3.keccak(code).hex()
+            cached = self.cache.get(code_hash)
+            
+            goplus_data, is_verified = await asyncio.gather(
+                self._scan_with_goplus_async(checksum_address),
+                self._check_verification_async(checksum_address),
+            )
+            goplus_data = self._with_code_flags(goplus_data, cached)
+            
+            return self._assess(checksum_address, code, code_hash, cached, goplus_data, is_verified)
             
         except Exception as e:
             return {
@@ -73,6 +176,53 @@ class EthereumScanner:
                 'address': address
             }
     
+    async def aclose(self) -> None:
+        """Close the pooled async client, if one was opened"""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+    
+    def _get_client(self):
+        if self._client is None:
+            from app.http_client import make_async_client
+            self._client = make_async_client(timeout=10)
+        return self._client
+    
+    def _with_code_flags(self, goplus_data: Dict, cached: Optional[Dict]) -> Dict:
+        """Per-address GoPlus data with the template's code-level verdict on top"""
+        if cached is None:
+            return goplus_data
+        return {**goplus_data, **cached['code_flags']}
+    
+    def _assess(self, checksum_address: str, code: bytes, code_hash: str,
+                cached: Optional[Dict], goplus_data: Dict, is_verified: Optional[bool]) -> Dict:
+        """Combine code, GoPlus and verification results into the risk report"""
+        if cached is None and goplus_data and not goplus_data.get('is_proxy'):
+            # Proxies share bytecode but not the logic behind them
+            self.cache.put(code_hash, goplus_data)
+        
+        # Calculate risk score (0-100)
+        risk_score = self._calculate_risk_score(goplus_data, is_verified, len(code.hex()))
+        flags = self._build_flags(goplus_data, is_verified)
+        verdict = self._get_verdict(risk_score)
+        
+        return {
+            'chain': 'ethereum',
+            'address': checksum_address,
+            'is_contract': True,
+            'risk_score': risk_score,
+            'verdict': verdict,
+            'checks': {
+                'bytecode_length': len(code.hex()),
+                'code_hash': code_hash,
+                'code_cache_hit': cached is not None,
+                'verified': is_verified,
+                'goplus_data': goplus_data
+            },
+            'flags': flags,
+            'recommendations': self._get_recommendations(risk_score)
+        }
+    
     def _wallet_response(self, address: str) -> Dict:
         """Return safe response for wallet addresses"""
         return {
@@ -90,43 +240,71 @@ class EthereumScanner:
         if not self.goplus_enabled:
             return {}
         
-        url = f"https://api.gopluslabs.io/api/v1/token_security/1?contract_addresses={address}"
+        import requests
         
         try:
-            response = requests.get(url, timeout=10)
-            data = response.json()
-            
-            if 'result' in data and address.lower() in data['result']:
-                token = data['result'][address.lower()]
-                return {
-                    'is_honeypot': token.get('is_honeypot', '0') == '1',
-                    'buy_tax': float(token.get('buy_tax', '0')),
-                    'sell_tax': float(token.get('sell_tax', '0')),
-                    'is_open_source': token.get('is_open_source', '0') == '1',
-                    'is_proxy': token.get('is_proxy', '0') == '1',
-                    'is_mintable': token.get('is_mintable', '0') == '1',
-                    'can_take_back_ownership': token.get('can_take_back_ownership', '0') == '1',
-                    'owner_change_balance': token.get('owner_change_balance', '0') == '1',
-                    'hidden_owner': token.get('hidden_owner', '0') == '1',
-                    'selfdestruct': token.get('selfdestruct', '0') == '1',
-                    'holder_count': int(token.get('holder_count', '0')),
-                    'lp_holder_count': int(token.get('lp_holder_count', '0'))
-                }
+            response = requests.get(GOPLUS_URL.format(address=address), timeout=10)
+            return self._parse_goplus(loads(response.content), address)
         except Exception as e:
             print(f"GoPlus API error: {e}")
         
         return {}
     
+    async def _scan_with_goplus_async(self, address: str) -> Dict:
+        """Async GoPlus lookup over the pooled client"""
+        if not self.goplus_enabled:
+            return {}
+        
+        try:
+            response = await self._get_client().get(GOPLUS_URL.format(address=address), timeout=10)
+            return self._parse_goplus(loads(response.content), address)
+        except Exception as e:
+            print(f"GoPlus API error: {e}")
+        
+        return {}
+    
+    def _parse_goplus(self, data: Dict, address: str) -> Dict:
+        """Normalize a GoPlus token_security response"""
+        if 'result' in data and address.lower() in data['result']:
+            token = data['result'][address.lower()]
+            return {
+                'is_honeypot': token.get('is_honeypot', '0') == '1',
+                'buy_tax': float(token.get('buy_tax', '0')),
+                'sell_tax': float(token.get('sell_tax', '0')),
+                'is_open_source': token.get('is_open_source', '0') == '1',
+                'is_proxy': token.get('is_proxy', '0') == '1',
+                'is_mintable': token.get('is_mintable', '0') == '1',
+                'can_take_back_ownership': token.get('can_take_back_ownership', '0') == '1',
+                'owner_change_balance': token.get('owner_change_balance', '0') == '1',
+                'hidden_owner': token.get('hidden_owner', '0') == '1',
+                'selfdestruct': token.get('selfdestruct', '0') == '1',
+                'holder_count': int(token.get('holder_count', '0')),
+                'lp_holder_count': int(token.get('lp_holder_count', '0'))
+            }
+        return {}
+    
     def _check_verification(self, address: str) -> bool:
         """Check Etherscan verification status"""
         if not ETHERSCAN_API:
             return None
         
-        url = f"https://api.etherscan.io/api?module=contract&action=getsourcecode&address={address}&apikey={ETHERSCAN_API}"
+        import requests
         
         try:
-            response = requests.get(url, timeout=5)
-            data = response.json()
+            response = requests.get(ETHERSCAN_URL.format(address=address, apikey=ETHERSCAN_API), timeout=5)
+            data = loads(response.content)
+            return data['result'][0]['SourceCode'] != ''
+        except:
+            return None
+    
+    async def _check_verification_async(self, address: str) -> bool:
+        """Async Etherscan verification lookup over the pooled client"""
+        if not ETHERSCAN_API:
+            return None
+        
+        try:
+            response = await self._get_client().get(ETHERSCAN_URL.format(address=address, apikey=ETHERSCAN_API), timeout=5)
+            data = loads(response.content)
             return data['result'][0]['SourceCode'] != ''
         except:
             return None
@@ -271,10 +449,30 @@ class EthereumScanner:
             ]
 
 
-# Singleton instance
-ethereum_scanner = EthereumScanner()
+# Singleton instance, created on first scan
+_ethereum_scanner: Optional[EthereumScanner] = None
+
+
+def get_ethereum_scanner() -> EthereumScanner:
+    """Return the shared scanner, constructing it on first use"""
+    global _ethereum_scanner
+    if _ethereum_scanner is None:
+        _ethereum_scanner = EthereumScanner()
+    return _ethereum_scanner
+
+
+def __getattr__(name: str):
+    # Keeps `from app.ethereum_scanner import ethereum_scanner` working lazily
+    if name == 'ethereum_scanner':
+        return get_ethereum_scanner()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 def scan_ethereum_contract(address: str) -> Dict:
     """Main entry point for Ethereum scanning"""
-    return ethereum_scanner.scan_contract(address)
+    return get_ethereum_scanner().scan_contract(address)
+
+
+async def scan_ethereum_contract_async(address: str) -> Dict:
+    """Entry point for callers already running inside an event loop"""
+    return await get_ethereum_scanner().scan_contract_async(address)
@@ -0,0 +1,142 @@
+"""
+Process-pool offload for CPU-bound batch work
+Numeric columns travel through one shared-memory block instead of being
+pickled: the parent packs them, the worker maps the same block as NumPy
+views and writes its outputs in place. The event loop only awaits.
+"""
+import asyncio
+import multiprocessing as mp
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from .token_batch import TokenBatch, score_columns
+
+# (column name, dtype str, byte offset, length)
+Layout = List[Tuple[str, str, int, int]]
+
+
+class SharedColumns:
+    """Equal-length numeric columns packed into one SharedMemory block"""
+
+    def __init__(self, shm: shared_memory.SharedMemory, layout: Layout, owner: bool):
+        self.shm = shm
+        self.layout = layout
+        self.owner = owner
+        self.arrays: Dict[str, np.ndarray] = {
+            name: np.ndarray((length,), dtype=np.dtype(dtype), buffer=shm.buf, offset=offset)
+            for name, dtype, offset, length in layout
+        }
+
+    @classmethod
+    def create(cls, inputs: Dict[str, np.ndarray], outputs: Dict[str, np.dtype]) -> "SharedColumns":
+        """Copy `inputs` in and reserve zeroed `outputs` columns of the same length"""
+        length = len(next(iter(inputs.values())))
+        specs = [(n, a.dtype) for n, a in inputs.items()] + [(n, np.dtype(d)) for n, d in outputs.items()]
+        layout: Layout = []
+        offset = 0
+        for name, dtype in specs:
+            # Keep every column 8-byte aligned
+            offset = (offset + 7) & ~7
+            layout.append((name, dtype.str, offset, length))
+            offset += dtype.itemsize * length
+        shm = shared_memory.SharedMemory(create=True, size=max(offset, 1))
+        shared = cls(shm, layout, owner=True)
+        for name, values in inputs.items():
+            shared.arrays[name][:] = values
+        for name in outputs:
+            shared.arrays[name][:] = 0
+        return shared
+
+    @property
+    def descriptor(self) -> Tuple[str, Layout]:
+        """What a worker needs to attach: small and cheap to pickle"""
+        return self.shm.name, self.layout
+
+    @classmethod
+    def attach(cls, descriptor: Tuple[str, Layout]) -> "SharedColumns":
+        name, layout = descriptor
+        return cls(shared_memory.SharedMemory(name=name), layout, owner=False)
+
+    def close(self) -> None:
+        # Views must go before the mapping can be released
+        self.arrays = {}
+        self.shm.close()
+        if self.owner:
+            self.shm.unlink()
+
+
+def _run_on_columns(fn: Callable[[Dict[str, np.ndarray]], None], descriptor: Tuple[str, Layout]) -> None:
+    """Worker side: map the block, let `fn` fill its outputs in place, detach"""
+    shared = SharedColumns.attach(descriptor)
+    try:
+        fn(shared.arrays)
+    finally:
+        shared.close()
+
+
+def score_kernel(columns: Dict[str, np.ndarray]) -> None:
+    columns['score_total'][:] = score_columns(
+        columns['liquidity_usd'], columns['volume_1h_usd'], columns['age_minutes'])
+
+
+class BatchExecutor:
+    """Runs CPU-bound batch work off the event loop; batches under min_rows stay inline"""
+
+    def __init__(self, process_workers: int = 0, min_rows: int = 20_000):
+        self.process_workers = process_workers
+        self.min_rows = min_rows
+        self._pool: Optional[ProcessPoolExecutor] = None
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(self.process_workers, mp_context=mp.get_context("spawn"))
+        return self._pool
+
+    def shutdown(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+    async def run(self, fn: Callable, *args):
+        """Any picklable call: in the pool when there is one, else on a thread"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._get_pool() if self.process_workers > 0 else None, fn, *args)
+
+    async def run_columns(self, fn: Callable[[Dict[str, np.ndarray]], None],
+                          inputs: Dict[str, np.ndarray], outputs: Dict[str, np.dtype]) -> Dict[str, np.ndarray]:
+        """
+        Call fn(columns) with `inputs` plus zeroed `outputs` columns, which
+        fn fills in place; returns copies of the outputs
+        """
+        rows = len(next(iter(inputs.values())))
+        if self.process_workers <= 0 or rows < self.min_rows:
+            columns = dict(inputs)
+            columns.update({name: np.zeros(rows, dtype=dtype) for name, dtype in outputs.items()})
+            fn(columns)
+            return {name: columns[name] for name in outputs}
+
+        loop = asyncio.get_running_loop()
+        # Packing and unpacking are bulk copies; keep them off the loop thread too
+        shared = await loop.run_in_executor(None, SharedColumns.create, inputs, outputs)
+        try:
+            await loop.run_in_executor(self._get_pool(), _run_on_columns, fn, shared.descriptor)
+            return await loop.run_in_executor(
+                None, lambda: {name: shared.arrays[name].copy() for name in outputs})
+        finally:
+            shared.close()
+
+    async def score(self, batch: TokenBatch) -> np.ndarray:
+        """TokenBatch.score, offloaded for large batches"""
+        if not len(batch):
+            return batch.score()
+        c = batch.columns
+        out = await self.run_columns(score_kernel, {
+            'liquidity_usd': c['liquidity_usd'],
+            'volume_1h_usd': c['volume_1h_usd'],
+            'age_minutes': c['age_minutes'],
+        }, {'score_total': np.float64})
+        c['score_total'] = out['score_total']
+        return c['score_total']
@@ -0,0 +1,45 @@
+"""
+JSON decoding for upstream API responses
+Uses orjson or msgspec when installed (pip install orjson), else the stdlib.
+Pass raw response bytes (r.content) so no intermediate str is built.
+With msgspec installed, decode() can also skip everything outside a
+declared Struct schema instead of materializing the whole document.
+"""
+from typing import Any, Optional, Union
+
+try:
+    import orjson as _orjson
+except ImportError:
+    _orjson = None
+
+try:
+    import msgspec as _msgspec
+except ImportError:
+    _msgspec = None
+
+if _orjson is not None:
+    BACKEND = "orjson"
+    _loads = _orjson.loads
+elif _msgspec is not None:
+    BACKEND = "msgspec"
+    _loads = _msgspec.json.Decoder().decode
+else:
+    import json as _json
+    BACKEND = "json"
+    _loads = _json.loads
+
+
+def loads(data: Union[bytes, str]) -> Any:
+    """Decode a JSON document with the fastest available backend"""
+    return _loads(data)
+
+
+def decode(data: Union[bytes, str], schema: Optional[type] = None) -> Any:
+    """
+    Decode into plain dicts/lists. When msgspec is available and a Struct
+    `schema` is given, only the schema's fields are decoded; otherwise
+    this is loads(). Callers must tolerate both (extra keys on fallback).
+    """
+    if schema is not None and _msgspec is not None:
+        return _msgspec.to_builtins(_msgspec.json.decode(data, type=schema))
+    return _loads(data)
@@ -1,10 +1,29 @@
-from typing import List
-from ..schemas import TokenInfo, FiltersConfig
+from typing import List, Tuple
+from ..schemas import FiltersConfig
+from ..records import AnyToken, TokenRecord
 
 
-def filter_tokens(tokens: List[TokenInfo], cfg: FiltersConfig) -> List[TokenInfo]:
+def _enriched_fields(token: AnyToken) -> Tuple[int, float, float, bool, float]:
+    """(holder_count, top1_pct, top5_pct, mint_revoked, lp_lock_ratio)"""
+    if isinstance(token, TokenRecord):
+        return token.holder_count, token.top1_pct, token.top5_pct, token.mint_revoked, token.lp_lock_ratio
+    h = token.holders
+    return h.holder_count, h.top1_pct, h.top5_pct, token.code_risk.mint_revoked, token.liquidity.lp_lock_ratio
+
+
+def filter_tokens(tokens: List[AnyToken], cfg: FiltersConfig) -> List[AnyToken]:
+    """
+    Applies both filter phases in one go.
+    The scan pipeline calls them separately so enrichment only runs
+    for tokens that survive filter_pre_enrichment.
     """
-    Filters TokenInfo objects based on FiltersConfig thresholds.
+    return filter_post_enrichment(filter_pre_enrichment(tokens, cfg), cfg)
+
+
+def filter_pre_enrichment(tokens: List[AnyToken], cfg: FiltersConfig) -> List[AnyToken]:
+    """
+    Phase one: cheap checks on fields already present on the DexScreener pair
+    (price, liquidity, FDV, age, trades, volume). No network calls.
     Returns only tokens that pass all checks.
     Safely handles missing data fields.
     """
@@ -34,22 +53,6 @@ def filter_tokens(tokens: List[TokenInfo], cfg: FiltersConfig) -> List[TokenInfo
                 print(f"  [X] Liquidity ${liquidity:,.0f} out of range (${cfg.min_liquidity_usd:,.0f} - ${cfg.max_liquidity_usd:,.0f})")
                 continue
             
-            # Holders check - OPTIONAL (DexScreener often doesn't have this)
-            if hasattr(cfg, 'min_holders') and cfg.min_holders > 0:
-                holder_count = None
-                
-                if hasattr(token, 'holders') and token.holders and hasattr(token.holders, 'holder_count'):
-                    holder_count = token.holders.holder_count
-                elif hasattr(token, 'holder_count'):
-                    holder_count = token.holder_count
-                
-                if holder_count is not None:
-                    if holder_count < cfg.min_holders:
-                        print(f"  [X] Holders {holder_count} < minimum {cfg.min_holders}")
-                        continue
-                else:
-                    print(f"  [!] Holder data unavailable - skipping holder check")
-            
             # Age check
             age_minutes = getattr(token, 'age_minutes', 0)
             age_days = age_minutes / 1440
@@ -63,6 +66,22 @@ def filter_tokens(tokens: List[TokenInfo], cfg: FiltersConfig) -> List[TokenInfo
                 print(f"  [X] Age {age_days:.1f} days > max {max_age_days:.0f} days")
                 continue
             
+            if age_minutes < cfg.min_age_minutes:
+                print(f"  [X] Age {age_minutes}m < minimum {cfg.min_age_minutes}m")
+                continue
+            
+            # FDV check - only when DexScreener reports one
+            fdv = getattr(token, 'fdv_usd', None)
+            if fdv and fdv > cfg.max_fdv_usd:
+                print(f"  [X] FDV ${fdv:,.0f} > max ${cfg.max_fdv_usd:,.0f}")
+                continue
+            
+            # Trades check - OPTIONAL
+            trades = getattr(token, 'dex_trades_5m', None)
+            if cfg.min_dex_trades_5m > 0 and trades is not None and trades < cfg.min_dex_trades_5m:
+                print(f"  [X] Trades {trades} < minimum {cfg.min_dex_trades_5m}")
+                continue
+            
             # Volume check - OPTIONAL
             if hasattr(cfg, 'min_volume_usd_1h') and cfg.min_volume_usd_1h > 0:
                 volume = 0
@@ -83,5 +102,52 @@ def filter_tokens(tokens: List[TokenInfo], cfg: FiltersConfig) -> List[TokenInfo
             print(f"  [!] Filter error: {e}")
             continue
 
-    print(f"\n[RESULT] {len(filtered)}/{len(tokens)} tokens passed filters\n")
+    print(f"\n[RESULT] {len(filtered)}/{len(tokens)} tokens passed phase-one filters\n")
+    return filtered
+
+
+def filter_post_enrichment(tokens: List[AnyToken], cfg: FiltersConfig) -> List[AnyToken]:
+    """
+    Phase two: checks on enriched fields (holders, taxes, mint authority,
+    LP lock). Fields that no enrichment filled in are skipped, not failed:
+    holder_count 0, taxes None and lp_lock_ratio 0 mean "unknown".
+    """
+    filtered = []
+
+    for token in tokens:
+        symbol = getattr(token, 'symbol', 'Unknown')
+        holder_count, top1_pct, top5_pct, mint_revoked, lp_lock = _enriched_fields(token)
+
+        if holder_count:
+            if holder_count < cfg.min_holders:
+                print(f"  [X] {symbol}: Holders {holder_count} < minimum {cfg.min_holders}")
+                continue
+            if top1_pct > cfg.max_top1_holder_pct:
+                print(f"  [X] {symbol}: Top holder {top1_pct:.1f}% > max {cfg.max_top1_holder_pct:.0f}%")
+                continue
+            if top5_pct > cfg.max_top5_holder_pct:
+                print(f"  [X] {symbol}: Top 5 holders {top5_pct:.1f}% > max {cfg.max_top5_holder_pct:.0f}%")
+                continue
+        elif cfg.min_holders > 0:
+            print(f"  [!] {symbol}: Holder data unavailable - skipping holder check")
+
+        if cfg.require_mint_authority_revoked and not mint_revoked:
+            print(f"  [X] {symbol}: Mint authority not revoked")
+            continue
+
+        buy_tax = getattr(token, 'buy_tax_bps', None)
+        sell_tax = getattr(token, 'sell_tax_bps', None)
+        if buy_tax is not None and buy_tax > cfg.max_buy_tax_bps:
+            print(f"  [X] {symbol}: Buy tax {buy_tax}bps > max {cfg.max_buy_tax_bps}bps")
+            continue
+        if sell_tax is not None and sell_tax > cfg.max_sell_tax_bps:
+            print(f"  [X] {symbol}: Sell tax {sell_tax}bps > max {cfg.max_sell_tax_bps}bps")
+            continue
+
+        if cfg.min_lp_lock_ratio > 0 and lp_lock and lp_lock < cfg.min_lp_lock_ratio:
+            print(f"  [X] {symbol}: LP lock {lp_lock:.0%} < minimum {cfg.min_lp_lock_ratio:.0%}")
+            continue
+
+        filtered.append(token)
+
     return filtered
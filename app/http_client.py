@@ -0,0 +1,24 @@
+"""
+Shared factory for pooled HTTP clients
+Long-lived clients keep TCP/TLS connections alive between requests
+"""
+from typing import Dict, Optional
+import httpx
+
+from . import replay
+
+
+def make_async_client(
+    timeout: float = 20,
+    max_connections: int = 20,
+    headers: Optional[Dict[str, str]] = None,
+) -> httpx.AsyncClient:
+    """Create a pooled AsyncClient; callers own it and must aclose() it"""
+    limits = httpx.Limits(
+        max_connections=max_connections,
+        max_keepalive_connections=max_connections,
+        keepalive_expiry=30,
+    )
+    # Record/replay (SCOUT_HTTP_RECORD / SCOUT_HTTP_REPLAY) swaps the transport
+    transport = replay.async_transport(limits)
+    return httpx.AsyncClient(timeout=timeout, limits=limits, headers=headers, transport=transport)
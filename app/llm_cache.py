@@ -0,0 +1,121 @@
+from __future__ import annotations
+import os, json, math, time, hashlib, asyncio, threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+# Persisted next to token_logs.csv in the project root
+DEFAULT_CACHE_PATH = Path(__file__).resolve().parent.parent / "llm_cache.json"
+
+# Field buckets for PROMPT_USER_TEMPLATE. Inputs that only moved within a
+# bucket between scans map to the same key and reuse the cached verdict.
+USD_FIELDS = {"fdv_usd", "liquidity_usd", "vol5m", "vol1h"}
+COUNT_FIELDS = {"age_minutes", "holder_count", "trades5m", "buyers5m", "sellers5m", "tw_f", "tg_m", "xm1h"}
+PCT_FIELDS = {"top1_pct", "top5_pct"}
+BPS_FIELDS = {"buy_tax_bps", "sell_tax_bps"}
+RATIO_FIELDS = {"lp_lock_ratio"}
+
+
+def _band_125(x: float) -> float:
+    """Snap a positive magnitude onto the 1-2-5 series (…, 1k, 2k, 5k, 10k, …)"""
+    if x <= 0:
+        return 0.0
+    exp = math.floor(math.log10(x))
+    mantissa = x / 10 ** exp
+    step = 1 if mantissa < 1.5 else 2 if mantissa < 3.5 else 5 if mantissa < 7.5 else 10
+    return float(step * 10 ** exp)
+
+
+def normalize_prompt_fields(fields: Dict[str, Any]) -> Dict[str, Any]:
+    out: Dict[str, Any] = {}
+    for k, v in fields.items():
+        if isinstance(v, bool) or not isinstance(v, (int, float)):
+            out[k] = v
+        elif k in USD_FIELDS or k in COUNT_FIELDS:
+            out[k] = _band_125(float(v))
+        elif k in PCT_FIELDS:
+            out[k] = round(float(v) / 5) * 5
+        elif k in BPS_FIELDS:
+            out[k] = round(float(v) / 100) * 100
+        elif k in RATIO_FIELDS:
+            out[k] = round(float(v), 1)
+        else:
+            out[k] = v
+    return out
+
+
+class LLMResponseCache:
+    """
+    TTL cache of raw LLM responses, persisted as JSON on disk.
+    put() only marks the cache dirty; flush() writes it from a worker thread,
+    at most once per flush_interval unless forced.
+    """
+
+    def __init__(self, path: Optional[Path] = DEFAULT_CACHE_PATH, ttl_seconds: float = 6 * 3600, max_entries: int = 5000,
+                 flush_interval: float = 30):
+        self.path = Path(path) if path else None
+        self.ttl = ttl_seconds
+        self.max_entries = max_entries
+        self.flush_interval = flush_interval
+        # Oldest write first, so eviction pops from the front
+        self._entries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._dirty = False
+        self._last_save = time.monotonic()
+        self._write_lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self._load()
+
+    @staticmethod
+    def make_key(model: str, system: str, template: str, fields: Dict[str, Any]) -> str:
+        blob = json.dumps([model, system, template, normalize_prompt_fields(fields)], sort_keys=True, default=str)
+        return hashlib.sha256(blob.encode()).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        entry = self._entries.get(key)
+        if entry is None or time.time() - entry["ts"] > self.ttl:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return entry["response"]
+
+    def put(self, key: str, response: str) -> None:
+        self._entries[key] = {"ts": time.time(), "response": response}
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        self._dirty = True
+
+    def _load(self) -> None:
+        if not self.path or not self.path.exists():
+            return
+        try:
+            data = json.loads(self.path.read_text())
+        except Exception:
+            return
+        now = time.time()
+        fresh = [(k, e) for k, e in data.items() if now - e.get("ts", 0) <= self.ttl]
+        self._entries = OrderedDict(sorted(fresh, key=lambda item: item[1]["ts"]))
+
+    async def flush(self, force: bool = True) -> None:
+        if not self._dirty or not self.path:
+            return
+        if not force and time.monotonic() - self._last_save < self.flush_interval:
+            return
+        # Snapshot on the loop thread; serializing and writing happen off it
+        entries = dict(self._entries)
+        self._dirty = False
+        self._last_save = time.monotonic()
+        await asyncio.to_thread(self._write, entries)
+
+    def save(self) -> None:
+        """Synchronous write, for callers outside an event loop"""
+        if self.path:
+            self._write(dict(self._entries))
+            self._dirty = False
+
+    def _write(self, entries: Dict[str, Dict[str, Any]]) -> None:
+        with self._write_lock:
+            tmp = self.path.with_suffix(".tmp")
+            tmp.write_text(json.dumps(entries))
+            os.replace(tmp, self.path)
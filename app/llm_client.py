@@ -1,17 +1,66 @@
 from __future__ import annotations
-import os, json
-from typing import Optional, Dict, Any
+import os, json, random, asyncio
+from typing import Optional, Dict, Any, List, Sequence, Tuple
 import httpx
+from .http_client import make_async_client
+from .fastjson import loads
+from .ratelimit import AsyncRateLimiter
+from .llm_cache import LLMResponseCache
+from .llm_prompts import (
+    PROMPT_SYSTEM_ANALYST, PROMPT_USER_TEMPLATE,
+    PROMPT_SYSTEM_ANALYST_BATCH, PROMPT_USER_BATCH_HEADER, PROMPT_USER_BATCH_ITEM,
+)
+
+VERDICTS = {"watchlist", "speculative", "avoid"}
+RETRY_STATUS = {408, 409, 429, 500, 502, 503, 504}
 
 # Minimal, provider-agnostic client. Fill in base URLs per your provider.
 # By default, attempts OpenAI-compatible /chat/completions.
 class LLMClient:
-    def __init__(self, model: str, temperature: float = 0.1, base_url: Optional[str] = None, api_key: Optional[str] = None):
+    def __init__(self, model: str, temperature: float = 0.1, base_url: Optional[str] = None, api_key: Optional[str] = None,
+                 cache: Optional[LLMResponseCache] = None, max_in_flight: int = 4,
+                 tokens_per_minute: Optional[int] = None, max_retries: int = 3,
+                 timeout: float = 30, backoff_base: float = 0.5, max_backoff: float = 30):
         self.model = model
         self.temperature = temperature
         self.base_url = base_url or os.getenv("LLM_BASE_URL","https://api.openai.com/v1")
         self.api_key = api_key or os.getenv("LLM_API_KEY")
         self.provider = os.getenv("LLM_PROVIDER","openai")
+        self.cache = cache
+        self.max_in_flight = max_in_flight
+        self.max_retries = max_retries
+        self.timeout = timeout
+        self.backoff_base = backoff_base
+        self.max_backoff = max_backoff
+        self._in_flight = asyncio.Semaphore(max_in_flight)
+        # Tokens-per-minute budget, charged with an estimate before each call
+        self._tpm = AsyncRateLimiter(rate=tokens_per_minute, per=60) if tokens_per_minute else None
+        self._client: Optional[httpx.AsyncClient] = None
+        self.retries = 0
+
+    def _get_client(self) -> httpx.AsyncClient:
+        # One pooled client for the lifetime of the LLMClient
+        if self._client is None:
+            self._client = make_async_client(timeout=self.timeout, max_connections=self.max_in_flight)
+        return self._client
+
+    async def aclose(self) -> None:
+        if self.cache:
+            await self.cache.flush()
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    def _backoff(self, attempt: int, response: Optional[httpx.Response] = None) -> float:
+        # Honour Retry-After up to max_backoff, plus jitter so concurrent
+        # retries do not wake together; else capped exponential with full jitter
+        if response is not None:
+            try:
+                retry_after = min(max(float(response.headers["retry-after"]), 0.0), self.max_backoff)
+                return retry_after + random.uniform(0, self.backoff_base)
+            except (KeyError, ValueError):
+                pass
+        return random.uniform(0, min(self.max_backoff, self.backoff_base * 2 ** attempt))
 
     async def chat(self, system: str, user: str, max_tokens: int = 600) -> str:
         headers = {"Authorization": f"Bearer {self.api_key}", "Content-Type": "application/json"}
@@ -21,21 +70,124 @@ class LLMClient:
             "max_tokens": max_tokens,
             "messages": [{"role":"system","content":system},{"role":"user","content":user}]
         }
-        async with httpx.AsyncClient(timeout=30) as client:
-            r = await client.post(f"{self.base_url}/chat/completions", headers=headers, json=payload)
-            r.raise_for_status()
-            data = r.json()
-        # OpenAI-compatible shape
-        return data["choices"][0]["message"]["content"]
-
-def parse_llm_json(s: str) -> Dict[str, Any]:
+        for attempt in range(self.max_retries + 1):
+            response = None
+            if self._tpm:
+                # Every attempt spends tokens: ~4 characters per token for
+                # the prompt, plus the completion cap
+                await self._tpm.wait((len(system) + len(user)) // 4 + max_tokens)
+            try:
+                async with self._in_flight:
+                    response = await self._get_client().post(f"{self.base_url}/chat/completions", headers=headers, json=payload)
+                response.raise_for_status()
+                data = loads(response.content)
+                # OpenAI-compatible shape
+                return data["choices"][0]["message"]["content"]
+            except (httpx.TransportError, httpx.HTTPStatusError) as e:
+                transient = not isinstance(e, httpx.HTTPStatusError) or e.response.status_code in RETRY_STATUS
+                if not transient or attempt == self.max_retries:
+                    raise
+                self.retries += 1
+                await asyncio.sleep(self._backoff(attempt, response))
+
+    async def evaluate(self, fields: Dict[str, Any], system: str = PROMPT_SYSTEM_ANALYST,
+                       template: str = PROMPT_USER_TEMPLATE, max_tokens: int = 600) -> Dict[str, Any]:
+        # Served from cache when the bucketed fields match a recent evaluation
+        key = self.cache.make_key(self.model, system, template, fields) if self.cache else None
+        if key:
+            cached = self.cache.get(key)
+            if cached is not None:
+                return parse_llm_json(cached)
+        content = await self.chat(system, template.format(**fields), max_tokens=max_tokens)
+        result = parse_llm_json(content)  # only cache responses that parse
+        if key:
+            self.cache.put(key, content)
+            await self.cache.flush(force=False)
+        return result
+
+    async def evaluate_batch(self, candidates: Sequence[Dict[str, Any]], batch_size: int = 10,
+                             max_retries: int = 1, max_tokens_per_item: int = 200) -> List[Optional[Dict[str, Any]]]:
+        """
+        Evaluate many candidates with one request per `batch_size` of them.
+        Results line up with `candidates`; items still invalid after
+        `max_retries` re-sends come back as None. Cached verdicts are shared
+        with evaluate(), so single and batch calls hit the same entries.
+        """
+        results: List[Optional[Dict[str, Any]]] = [None] * len(candidates)
+        keys: List[Optional[str]] = [None] * len(candidates)
+        pending: List[int] = []
+        for i, fields in enumerate(candidates):
+            if self.cache:
+                keys[i] = self.cache.make_key(self.model, PROMPT_SYSTEM_ANALYST, PROMPT_USER_TEMPLATE, fields)
+                cached = self.cache.get(keys[i])
+                if cached is not None:
+                    results[i] = parse_llm_json(cached)
+                    continue
+            pending.append(i)
+
+        for _ in range(max_retries + 1):
+            if not pending:
+                break
+            failed: List[int] = []
+            for start in range(0, len(pending), batch_size):
+                chunk = pending[start:start + batch_size]
+                user = PROMPT_USER_BATCH_HEADER.format(count=len(chunk)) + "\n".join(
+                    PROMPT_USER_BATCH_ITEM.format(id=i, **candidates[i]) for i in chunk
+                )
+                try:
+                    content = await self.chat(PROMPT_SYSTEM_ANALYST_BATCH, user,
+                                              max_tokens=max_tokens_per_item * len(chunk) + 100)
+                    parsed, bad = parse_llm_batch(content, [str(i) for i in chunk])
+                except Exception:
+                    failed.extend(chunk)
+                    continue
+                for i in chunk:
+                    item = parsed.get(str(i))
+                    if item is None:
+                        continue
+                    results[i] = item
+                    if keys[i]:
+                        self.cache.put(keys[i], json.dumps(item))
+                failed.extend(int(b) for b in bad)
+            # Retry only the items that were missing or malformed
+            pending = failed
+        if self.cache:
+            # One write per batch, not per item
+            await self.cache.flush()
+        return results
+
+def parse_llm_json(s: str) -> Any:
     # Attempt to recover JSON even if model added text; be strict first.
     try:
         return json.loads(s)
     except Exception:
-        # Fallback: find first/last braces
-        start = s.find("{")
-        end = s.rfind("}")
-        if start >= 0 and end > start:
-            return json.loads(s[start:end+1])
+        # Fallback: outermost object or array, whichever opens first
+        starts = [i for i in (s.find("{"), s.find("[")) if i >= 0]
+        if starts:
+            start = min(starts)
+            end = s.rfind("}" if s[start] == "{" else "]")
+            if end > start:
+                return json.loads(s[start:end+1])
         raise
+
+def validate_verdict(item: Any) -> bool:
+    # Schema from PROMPT_SYSTEM_ANALYST
+    if not isinstance(item, dict) or item.get("verdict") not in VERDICTS:
+        return False
+    if not isinstance(item.get("rationale"), str) or not isinstance(item.get("risks", []), list):
+        return False
+    conf = item.get("confidence_0to1")
+    return isinstance(conf, (int, float)) and not isinstance(conf, bool) and 0.0 <= conf <= 1.0
+
+def parse_llm_batch(s: str, ids: Sequence[str]) -> Tuple[Dict[str, Dict[str, Any]], List[str]]:
+    # Returns (valid items by id, ids that were missing or failed validation)
+    data = parse_llm_json(s)
+    if isinstance(data, dict):
+        data = data.get("results", [data])
+    valid: Dict[str, Dict[str, Any]] = {}
+    if isinstance(data, list):
+        for item in data:
+            if isinstance(item, dict) and str(item.get("id")) in ids and validate_verdict(item):
+                item = dict(item)
+                valid[str(item.pop("id"))] = item
+    return valid, [i for i in ids if i not in valid]
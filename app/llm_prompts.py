@@ -5,8 +5,7 @@ PROMPT_SYSTEM_ANALYST = (
     "Be concise. Do not reveal step-by-step reasoning. Base your decision only on the provided fields."
 )
 
-PROMPT_USER_TEMPLATE = (
-    "Evaluate this token candidate. Return JSON only.\n"
+PROMPT_USER_FIELDS = (
     "name={name} symbol={symbol} chain={chain}\n"
     "age_minutes={age_minutes} fdv_usd={fdv_usd}\n"
     "liquidity_usd={liquidity_usd} lp_lock_ratio={lp_lock_ratio} buy_tax_bps={buy_tax_bps} sell_tax_bps={sell_tax_bps}\n"
@@ -17,6 +16,21 @@ PROMPT_USER_TEMPLATE = (
     "honeypot_flag={honeypot}"
 )
 
+PROMPT_USER_TEMPLATE = "Evaluate this token candidate. Return JSON only.\n" + PROMPT_USER_FIELDS
+
+# Batch mode: N candidates per request, one JSON array back
+PROMPT_SYSTEM_ANALYST_BATCH = (
+    "You are a cautious crypto risk analyst. You will receive several token candidates, each introduced by "
+    "a line \"### id=<id>\". You must output only a JSON array with exactly one object per candidate, "
+    "in any order, each matching the schema:\n"
+    "{\n  \"id\": \"<id as given>\",\n  \"verdict\": \"watchlist|speculative|avoid\",\n"
+    "  \"rationale\": \"string (<= 2 sentences)\",\n  \"risks\": [\"string\"],\n  \"confidence_0to1\": 0.0-1.0\n}\n"
+    "Be concise. Do not reveal step-by-step reasoning. Judge each candidate only on its own fields."
+)
+
+PROMPT_USER_BATCH_HEADER = "Evaluate these {count} token candidates. Return a JSON array only.\n"
+PROMPT_USER_BATCH_ITEM = "### id={id}\n" + PROMPT_USER_FIELDS
+
 # Meta-prompt for optimizing prompts with logs
 PROMPT_ENGINEER = (
     "You are a prompt engineer. Given model outputs, user feedback, and false positives/negatives, "
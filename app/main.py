@@ -1,25 +1,41 @@
 from dotenv import load_dotenv
 load_dotenv()
 
+import os
 import asyncio
 import yaml
 import re
+import time
 from pathlib import Path
 from datetime import datetime, timezone
-from app.data_sources.dexscreener import fetch_new_listings
-from app.schemas import TokenInfo, LiquidityInfo, VolumeInfo, FiltersConfig
-from app.filters import filter_tokens
+from collections import defaultdict
+from typing import Dict, List, Optional
+from app.data_sources.dexscreener import (
+    fetch_search_pairs, settle_pairs, forget_search_responses, chain_request_stats,
+)
+from app.schemas import FiltersConfig
+from app.records import TokenRecord
+from app.token_batch import TokenBatch
+from app.filters import filter_post_enrichment
 from app.scorer import score_tokens
 from app.alerting.telegram_alert import send_telegram_alert
 from app.logger import log_token
-from app.momentum_tracker import detect_momentum_spike
+from app.momentum_tracker import detect_momentum_spike, log_momentum
 from app.coingecko_client import CoinGeckoClient
-from app.ethereum_scanner import scan_ethereum_contract
+from app.data_sources.birdeye import BirdeyeSource
+from app.data_sources.discovery import FeedDiscovery
+from app.scheduler import ScanScheduler
+from app.watchlist import Watchlist, WatchEntry
+from app.sharding import ShardPool
+from app.executor import BatchExecutor
 
 
 
-# Keep track of tokens we've already processed
-processed_addresses = set()
+# Keep track of tokens we've already processed, per chain
+processed_addresses: Dict[str, set] = defaultdict(set)
+# Every address a scan reached a verdict on, per chain; only first
+# sightings count as new listings for the scan scheduler
+seen_addresses: Dict[str, set] = defaultdict(set)
 
 
 
@@ -45,30 +61,57 @@ def load_config_with_env(config_path='config.yaml'):
 
 
 
-async def process_token(token: TokenInfo, cfg: FiltersConfig, coingecko: CoinGeckoClient):
+async def enrich_holders(token: TokenRecord, birdeye: BirdeyeSource) -> None:
     """
-    Process a single token:
-    - Apply filters
+    Attach Birdeye holder distribution and mint authority to a token.
+    BirdeyeSource caps concurrency/rate and caches results per address.
+    """
+    try:
+        holders, code_risk = await birdeye.enrich_with_birdeye(token.address)
+        if holders.holder_count:
+            token.holder_count = holders.holder_count
+            token.top1_pct = holders.top1_pct
+            token.top5_pct = holders.top5_pct
+        token.mint_revoked = code_risk.mint_revoked
+    except Exception as e:
+        print(f"  [Birdeye] No holder data for {token.symbol}: {e}")
+
+
+
+def apply_coingecko(token: TokenRecord, cg_data: Dict) -> None:
+    """Copy the CoinGecko coin-document fields the pipeline uses onto a record"""
+    token.coingecko_score = cg_data.get('coingecko_score')
+    token.community_score = cg_data.get('community_score')
+    token.liquidity_score = cg_data.get('liquidity_score')
+    token.twitter_followers = cg_data.get('twitter_followers')
+    token.telegram_users = cg_data.get('telegram_users')
+
+
+async def process_token(token: TokenRecord, cfg: FiltersConfig, coingecko: CoinGeckoClient,
+                        birdeye: Optional[BirdeyeSource] = None):
+    """
+    Process a single token that already passed the phase-one filters:
+    - Enrich with Birdeye holders (optional)
+    - Apply phase-two filters (holders, taxes, mint authority, LP lock)
     - Fetch CoinGecko data
     - Score it
     - Detect momentum
     - Log
     - Send Telegram alerts
     """
-    if not filter_tokens([token], cfg):
+    # Birdeye is configured for Solana only
+    if birdeye is not None and token.chain == 'solana':
+        await enrich_holders(token, birdeye)
+    if not filter_post_enrichment([token], cfg):
         return None
 
 
     # Fetch additional data from CoinGecko
     try:
-        cg_data = await coingecko.get_token_data(token.address)
+        cg_data = await coingecko.get_token_data(token.address, token.chain)
         
         if cg_data:
-            token.coingecko_score = cg_data.get('coingecko_score')
-            token.community_score = cg_data.get('community_score')
-            token.liquidity_score = cg_data.get('liquidity_score')
-            token.twitter_followers = cg_data.get('twitter_followers')
-            token.telegram_users = cg_data.get('telegram_users')
+            apply_coingecko(token, cg_data)
             
             if token.community_score:
                 print(f"  [CoinGecko] Enhanced {token.symbol} - Community: {token.community_score:.1f}/100")
@@ -79,23 +122,96 @@ async def process_token(token: TokenInfo, cfg: FiltersConfig, coingecko: CoinGec
 
 
     score_tokens(token)
-    detect_momentum_spike(token)
-    log_token(token)
-    await send_telegram_alert(token)
+    # Logger, momentum and alerting take the plain-dict boundary shape
+    token_dict = token.to_dict()
+    detect_momentum_spike(token_dict)
+    log_token(token_dict)
+    await send_telegram_alert(token_dict)
 
 
     return token
 
 
 
+async def refresh_coin_documents(entries: List[WatchEntry], coingecko: CoinGeckoClient, max_age: float) -> None:
+    """
+    Re-fetch the CoinGecko coin document of watched tokens whose copy is
+    older than max_age seconds. Only coins CoinGecko already resolved are
+    asked for, so these go to the light /coins/{id} endpoint.
+    """
+    now = time.monotonic()
+    stale = [e for e in entries
+             if now - e.coingecko_at >= max_age and coingecko.knows(e.record.address, e.record.chain)]
+    if not stale:
+        return
+    docs = await asyncio.gather(*(coingecko.get_token_data(e.record.address, e.record.chain) for e in stale))
+    for entry, cg_data in zip(stale, docs):
+        entry.coingecko_at = now
+        if cg_data:
+            apply_coingecko(entry.record, cg_data)
+
+
+async def refresh_market_quotes(entries: List[WatchEntry], coingecko: CoinGeckoClient, chain: str) -> None:
+    """
+    Batch-refresh CoinGecko quotes for the watched tokens it lists. Its
+    price and 24h volume aggregate every venue, where the DexScreener
+    snapshot only covers the deepest pool, so they take precedence.
+    """
+    known = [e.record for e in entries if coingecko.knows(e.record.address, chain)]
+    if not known:
+        return
+    quotes = await coingecko.refresh_prices([t.address for t in known], chain)
+    for token in known:
+        quote = quotes.get(token.address)
+        if not quote:
+            continue
+        if quote.get('price_usd'):
+            token.price_usd = float(quote['price_usd'])
+        if quote.get('volume_24h'):
+            token.volume_24h_usd = float(quote['volume_24h'])
+
+
+async def watch_tokens(watchlist: Watchlist, coingecko: Optional[CoinGeckoClient] = None):
+    """
+    Re-poll tracked tokens as they come due, re-score them and feed the
+    momentum log; a detected spike sends one Telegram alert per token.
+    With a CoinGecko client, prices are refreshed in one batched request
+    per poll and coin documents once per slow_interval.
+    """
+    while True:
+        try:
+            await watchlist.wait_due()
+            refreshed = await watchlist.poll()
+            if coingecko is not None and refreshed:
+                await refresh_market_quotes(refreshed, coingecko, watchlist.chain)
+                await refresh_coin_documents(refreshed, coingecko, watchlist.slow_interval)
+            for entry in refreshed:
+                token = entry.record
+                score_tokens(token)
+                token_dict = token.to_dict()
+                log_momentum(token_dict)
+                if not entry.alerted and detect_momentum_spike(token_dict):
+                    entry.alerted = True
+                    print(f"[MOMENTUM] Spike on ${token.symbol} ({token.address})")
+                    await send_telegram_alert(token_dict)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            print(f"[ERROR] Watchlist poll failed: {e}")
+            await asyncio.sleep(watchlist.fast_interval)
+
+
+
 async def process_ethereum_token(address: str):
     """
     Process an Ethereum contract address
-    Uses the ethereum_scanner module
+    Uses the ethereum_scanner module (imported lazily, Solana runs skip it)
     """
+    from app.ethereum_scanner import scan_ethereum_contract_async
+    
     try:
         print(f"\n[ETHEREUM SCAN] Analyzing contract: {address}")
-        result = scan_ethereum_contract(address)
+        result = await scan_ethereum_contract_async(address)
         
         if result.get('error'):
             print(f"  ❌ Error: {result['error']}")
@@ -130,82 +246,196 @@ async def process_ethereum_token(address: str):
 
 
 
-async def main(cfg: FiltersConfig):
-    """Main scanning loop"""
-    print("\n" + "="*70)
-    print("MEMECOIN SCOUT - HIDDEN GEM SCANNER")
-    print("="*70)
-    print(f"[{datetime.now(timezone.utc).strftime('%Y-%m-%d %H:%M:%S')}] Starting...")
-    print(f"Filters: Liquidity ${cfg.min_liquidity_usd:,.0f} - ${cfg.max_liquidity_usd:,.0f}")
-    print(f"Price: ${cfg.min_price_usd} - ${cfg.max_price_usd}")
-    print(f"Max Age: {cfg.max_age_minutes} minutes")
-    print(f"API Keys: Loaded from .env")
-    print("="*70 + "\n")
-    
-    # Initialize CoinGecko client
-    coingecko = CoinGeckoClient()
-    print(f"[{datetime.now(timezone.utc).strftime('%H:%M:%S')}] CoinGecko client initialized\n")
-    
-    scan_count = 0
+async def scan_chain(chain: str, cfg: FiltersConfig, coingecko: CoinGeckoClient,
+                     birdeye: Optional[BirdeyeSource], watchlist: Optional[Watchlist],
+                     search_queries: Optional[List[str]], feed_pairs: Optional[List[dict]],
+                     scan_count: int, pool: Optional[ShardPool] = None,
+                     executor: Optional[BatchExecutor] = None) -> int:
+    """
+    One scan of one chain: search (plus pairs from the shared feed
+    discovery), filter, enrich and report. Returns the number of new
+    listings (addresses seen for the first time). With a shard pool,
+    enrichment onwards runs in the worker owning each address.
+    """
+    # Unchanged searches and pairs are dropped before parsing
+    search_pairs = await fetch_search_pairs(chain=chain, queries=search_queries, changed_only=True)
+    try:
+        pairs = search_pairs + (feed_pairs or [])
+        new_count = await evaluate_pairs(chain, pairs, cfg, coingecko, birdeye, watchlist, scan_count, pool, executor)
+    except Exception:
+        # Nothing got a verdict: take this chain's searches in full next time
+        forget_search_responses(chain)
+        raise
+    # Only now are unchanged repeats of these pairs safe to skip
+    settle_pairs(chain, search_pairs, cfg.min_age_minutes)
+    return new_count
+
+
+async def evaluate_pairs(chain: str, pairs: List[dict], cfg: FiltersConfig, coingecko: CoinGeckoClient,
+                         birdeye: Optional[BirdeyeSource], watchlist: Optional[Watchlist], scan_count: int,
+                         pool: Optional[ShardPool] = None, executor: Optional[BatchExecutor] = None) -> int:
+    """Filter, enrich and report a scan's raw pairs; returns the number of first-seen addresses"""
+    new_tokens = TokenBatch.from_pairs(pairs, chain).exclude(processed_addresses[chain])
+    # Changed pairs of known tokens are re-evaluated but are not new listings
+    first_seen = set(new_tokens.address) - seen_addresses[chain]
+
+
+    if not len(new_tokens):
+        print(f"[{datetime.now(timezone.utc).strftime('%H:%M:%S')}] [{chain}] No new hidden gems found this scan")
+        return 0
+
+    # Phase one runs vectorized on the whole scan; only survivors get
+    # enriched, most promising first
+    candidates = new_tokens.filter(cfg)
+    if executor is not None:
+        await executor.score(candidates)
+    else:
+        candidates.score()
+    candidates = candidates.sort()
+    print(f"[{datetime.now(timezone.utc).strftime('%H:%M:%S')}] [{chain}] Enriching {len(candidates)}/{len(new_tokens)} new tokens...\n")
     
-    while True:
-        try:
-            scan_count += 1
-            print(f"\n{'-'*70}")
-            print(f"[SCAN #{scan_count}] {datetime.now(timezone.utc).strftime('%H:%M:%S UTC')}")
-            print(f"{'-'*70}")
-            
-            new_tokens = await fetch_new_listings(chain='solana', cfg=cfg, max_age_minutes=cfg.max_age_minutes)
-            new_tokens = [t for t in new_tokens if t.address not in processed_addresses]
+    if pool is not None:
+        processed_tokens = await pool.process(chain, candidates.to_records())
+    else:
+        tasks = [process_token(t, cfg, coingecko, birdeye) for t in candidates.to_records()]
+        results = await asyncio.gather(*tasks)
+        processed_tokens = [t for t in results if t is not None]
 
 
-            if not new_tokens:
-                print(f"[{datetime.now(timezone.utc).strftime('%H:%M:%S')}] No new hidden gems found this scan")
-            else:
-                print(f"[{datetime.now(timezone.utc).strftime('%H:%M:%S')}] Processing {len(new_tokens)} new tokens...\n")
-                
-                tasks = [process_token(t, cfg, coingecko) for t in new_tokens]
-                results = await asyncio.gather(*tasks)
-                processed_tokens = [t for t in results if t is not None]
+    if processed_tokens:
+        top = TokenBatch.from_records(processed_tokens, chain).argtop_k(5)
 
 
-                if processed_tokens:
-                    processed_tokens.sort(
-                        key=lambda x: x.score_total if x.score_total is not None else x.liquidity.usd,
-                        reverse=True
-                    )
+        print(f"\nTOP HIDDEN GEMS on {chain} (Scan #{scan_count}):")
+        print("-"*70)
+        for i, t in enumerate((processed_tokens[j] for j in top), 1):
+            score_display = f"{t.score_total:.2f}" if t.score_total else "N/A"
+            cg_display = f"CG:{t.coingecko_score:.0f}" if t.coingecko_score else ""
+            print(
+                f"  {i}. ${t.symbol} | Price: ${t.price_usd:.8f} | "
+                f"Liq: ${t.liquidity_usd:,.0f} | Score: {score_display} {cg_display} | Age: {t.age_minutes}m"
+            )
 
 
-                    print(f"\nTOP HIDDEN GEMS (Scan #{scan_count}):")
-                    print("-"*70)
-                    for i, t in enumerate(processed_tokens[:5], 1):
-                        score_display = f"{t.score_total:.2f}" if t.score_total else "N/A"
-                        cg_display = f"CG:{t.coingecko_score:.0f}" if t.coingecko_score else ""
-                        print(
-                            f"  {i}. ${t.symbol} | Price: ${t.price_usd:.8f} | "
-                            f"Liq: ${t.liquidity.usd:,.0f} | Score: {score_display} {cg_display} | Age: {t.age_minutes}m"
-                        )
+        for t in processed_tokens:
+            processed_addresses[chain].add(t.address)
+            if watchlist is not None:
+                watchlist.add(t)
+    else:
+        print(f"[{datetime.now(timezone.utc).strftime('%H:%M:%S')}] [{chain}] No tokens passed all filters")
 
+    seen_addresses[chain].update(first_seen)
+    return len(first_seen)
 
-                    for t in processed_tokens:
-                        processed_addresses.add(t.address)
-                else:
-                    print(f"[{datetime.now(timezone.utc).strftime('%H:%M:%S')}] No tokens passed all filters")
 
 
-            next_scan = datetime.now(timezone.utc)
-            print(f"\n[{datetime.now(timezone.utc).strftime('%H:%M:%S')}] Next scan in 60 seconds")
-            
-            await asyncio.sleep(60)
+async def chain_loop(chain: str, cfg: FiltersConfig, coingecko: CoinGeckoClient,
+                     birdeye: Optional[BirdeyeSource], watchlist: Optional[Watchlist],
+                     scheduler: ScanScheduler, search_queries: Optional[List[str]],
+                     feed_buffer: Dict[str, Dict[str, dict]], pool: Optional[ShardPool] = None,
+                     executor: Optional[BatchExecutor] = None):
+    """Scan one chain forever on its own schedule; its errors and 429s only slow it down"""
+    scan_count = 0
+    while True:
+        scheduler.start()
+        throttled_before = chain_request_stats.get(chain, {}).get("throttled", 0)
+        scan_count += 1
+        print(f"\n{'-'*70}")
+        print(f"[SCAN #{scan_count}] [{chain}] {datetime.now(timezone.utc).strftime('%H:%M:%S UTC')}")
+        print(f"{'-'*70}")
+
+        feed_pairs = list(feed_buffer.pop(chain, {}).values())
+        try:
+            new_count = await scan_chain(chain, cfg, coingecko, birdeye, watchlist, search_queries,
+                                         feed_pairs, scan_count, pool, executor)
+            error = False
+        except Exception as e:
+            print(f"[ERROR] Scan of {chain} failed: {e}")
+            # Feed discovery will not list these again; keep them for the next try
+            for p in feed_pairs:
+                feed_buffer.setdefault(chain, {}).setdefault(p.get("pairAddress"), p)
+            new_count, error = 0, True
+
+        throttled = chain_request_stats.get(chain, {}).get("throttled", 0) - throttled_before
+        scheduler.record(new_count=new_count, throttled=throttled, error=error)
+        print(f"\n[{datetime.now(timezone.utc).strftime('%H:%M:%S')}] [{chain}] Next scan in {scheduler.delay():.0f} seconds")
+        await scheduler.wait()
 
 
-        except KeyboardInterrupt:
-            print("\n\n[INFO] Scanner stopped by user")
-            break
+async def discover_listings(discovery: FeedDiscovery, cfg: FiltersConfig,
+                            feed_buffer: Dict[str, Dict[str, dict]], scheduler: ScanScheduler):
+    """
+    Poll the cross-chain profile/boost feeds on their own schedule and leave
+    the resolved pairs for each chain's next scan
+    """
+    while True:
+        scheduler.start()
+        try:
+            found = await discovery.poll_pairs(min_age_minutes=cfg.min_age_minutes)
+            for chain, pairs in found.items():
+                buffered = feed_buffer.setdefault(chain, {})
+                for p in pairs:
+                    buffered[p.get("pairAddress")] = p
+            scheduler.record(new_count=sum(len(p) for p in found.values()))
         except Exception as e:
-            print(f"[ERROR] Main loop exception: {e}")
-            print(f"[INFO] Retrying in 30 seconds...")
-            await asyncio.sleep(30)
+            print(f"[ERROR] Feed discovery failed: {e}")
+            scheduler.record(error=True)
+        await scheduler.wait()
+
+
+async def main(cfg: FiltersConfig, birdeye: Optional[BirdeyeSource] = None,
+               scheduler: Optional[ScanScheduler] = None, watchlists: Optional[Dict[str, Watchlist]] = None,
+               discovery: Optional[FeedDiscovery] = None,
+               search_queries: Optional[Dict[str, List[str]]] = None, pool: Optional[ShardPool] = None,
+               executor: Optional[BatchExecutor] = None):
+    """
+    Main scanning loop: every chain in cfg.chains runs its own scan loop,
+    with its own copy of `scheduler`, so a slow or throttled chain never
+    holds the others back. With a shard pool the workers own enrichment and
+    the watchlists.
+    """
+    if scheduler is None:
+        scheduler = ScanScheduler()
+    watchlists = watchlists or {}
+    search_queries = search_queries or {}
+    print("\n" + "="*70)
+    print("MEMECOIN SCOUT - HIDDEN GEM SCANNER")
+    print("="*70)
+    print(f"[{datetime.now(timezone.utc).strftime('%Y-%m-%d %H:%M:%S')}] Starting...")
+    print(f"Chains: {', '.join(cfg.chains)}")
+    print(f"Filters: Liquidity ${cfg.min_liquidity_usd:,.0f} - ${cfg.max_liquidity_usd:,.0f}")
+    print(f"Price: ${cfg.min_price_usd} - ${cfg.max_price_usd}")
+    print(f"Max Age: {cfg.max_age_minutes} minutes")
+    if pool is not None:
+        print(f"Workers: {pool.workers} shard processes")
+    print(f"Scan Interval: {scheduler.base_interval:.0f}s per chain (adaptive {scheduler.min_interval:.0f}-{scheduler.max_interval:.0f}s)")
+    print(f"API Keys: Loaded from .env")
+    print("="*70 + "\n")
+    
+    # Initialize CoinGecko client
+    coingecko = CoinGeckoClient()
+    print(f"[{datetime.now(timezone.utc).strftime('%H:%M:%S')}] CoinGecko client initialized")
+    print(f"[{datetime.now(timezone.utc).strftime('%H:%M:%S')}] Birdeye holder enrichment {'enabled' if birdeye else 'disabled'}")
+    print(f"[{datetime.now(timezone.utc).strftime('%H:%M:%S')}] Profile/boost feed discovery {'enabled' if discovery else 'disabled'}")
+    print(f"[{datetime.now(timezone.utc).strftime('%H:%M:%S')}] Momentum watchlist {'in shard workers' if pool else 'enabled' if watchlists else 'disabled'}\n")
+    
+    # chain -> {pairAddress: pair} resolved from the feeds, drained by each scan
+    feed_buffer: Dict[str, Dict[str, dict]] = {}
+    tasks = [asyncio.create_task(watch_tokens(w, coingecko)) for w in watchlists.values()]
+    if discovery is not None:
+        tasks.append(asyncio.create_task(discover_listings(discovery, cfg, feed_buffer, scheduler.copy())))
+    tasks += [
+        asyncio.create_task(chain_loop(chain, cfg, coingecko, birdeye, watchlists.get(chain), scheduler.copy(),
+                                       search_queries.get(chain), feed_buffer, pool, executor))
+        for chain in cfg.chains
+    ]
+    try:
+        await asyncio.gather(*tasks)
+    except KeyboardInterrupt:
+        print("\n\n[INFO] Scanner stopped by user")
+    finally:
+        for task in tasks:
+            task.cancel()
 
 
 
@@ -216,7 +446,24 @@ if __name__ == "__main__":
     parser.add_argument("--live", action="store_true", help="Run in live mode")
     parser.add_argument("--config", type=str, default="../config.yaml", help="Path to config file")
     parser.add_argument("--eth-scan", type=str, help="Scan a single Ethereum contract address")
+    parser.add_argument("--record", type=str, help="Record upstream HTTP traffic to this tape (.jsonl.gz)")
+    parser.add_argument("--replay", type=str, help="Serve upstream HTTP traffic from this tape instead of the network")
+    parser.add_argument("--replay-latency", type=str, default="0",
+                        help="Replay delay in seconds, or 'recorded' for the original timings")
+    parser.add_argument("--replay-error-rate", type=float, default=0.0, help="Fraction of replayed requests failing with 503")
+    parser.add_argument("--workers", type=int, default=0,
+                        help="Shard enrichment/scoring/momentum across N worker processes (0 = in-process)")
     args = parser.parse_args()
+    if args.eth_scan and (args.replay or args.record):
+        parser.error("--eth-scan cannot be recorded or replayed: its RPC, GoPlus and Etherscan calls bypass the tape")
+    
+    # Through the environment so shard workers inherit the mode
+    if args.replay:
+        os.environ["SCOUT_HTTP_REPLAY"] = args.replay
+        os.environ["SCOUT_REPLAY_LATENCY"] = args.replay_latency
+        os.environ["SCOUT_REPLAY_ERROR_RATE"] = str(args.replay_error_rate)
+    elif args.record:
+        os.environ["SCOUT_HTTP_RECORD"] = args.record
     
     # Handle Ethereum contract scanning mode
     if args.eth_scan:
@@ -224,6 +471,7 @@ if __name__ == "__main__":
         print("ETHEREUM CONTRACT SECURITY SCANNER")
         print("="*70)
         
+        from app.ethereum_scanner import scan_ethereum_contract
         result = scan_ethereum_contract(args.eth_scan)
         
         if result.get('error'):
@@ -260,7 +508,7 @@ if __name__ == "__main__":
             print(f"\n{'='*70}\n")
             exit(0)
     
-    # Continue with normal Solana scanning mode
+    # Continue with normal multi-chain scanning mode
     try:
         # Load config with environment variable support
         config_path = Path(args.config)
@@ -270,17 +518,65 @@ if __name__ == "__main__":
         global_section = config_data.get('global', {})
         
         cfg = FiltersConfig(
+            chains=global_section.get('chains', ['solana']),
             min_liquidity_usd=filters_section.get('min_liquidity_usd', global_section.get('min_liquidity_usd', 3000)),
             max_liquidity_usd=filters_section.get('max_liquidity_usd', 750000),
             min_price_usd=filters_section.get('min_price_usd', 0.0000001),
             max_price_usd=filters_section.get('max_price_usd', 0.10),
-            min_holders=global_section.get('min_holders', 50),
-            max_age_minutes=global_section.get('max_age_minutes', 720),
-            min_dex_trades_5m=global_section.get('min_dex_trades_5m', 5),
-            min_volume_usd_1h=global_section.get('min_volume_usd_1h', 500),
-            require_contract_verified=global_section.get('require_contract_verified', False),
-            require_owner_renounced_or_timelock=global_section.get('require_owner_renounced_or_timelock', False),
-            require_mint_authority_revoked=global_section.get('require_mint_authority_revoked', True),
+            max_fdv_usd=filters_section.get('max_fdv_usd', global_section.get('max_fdv_usd', 50_000_000)),
+            min_age_minutes=filters_section.get('min_age_minutes', global_section.get('min_age_minutes', 0)),
+            max_buy_tax_bps=filters_section.get('max_buy_tax_bps', global_section.get('max_buy_tax_bps', 10_000)),
+            max_sell_tax_bps=filters_section.get('max_sell_tax_bps', global_section.get('max_sell_tax_bps', 10_000)),
+            min_lp_lock_ratio=filters_section.get('min_lp_lock_ratio', global_section.get('min_lp_lock_ratio', 0.0)),
+            min_holders=filters_section.get('min_holders', global_section.get('min_holders', 50)),
+            max_top1_holder_pct=filters_section.get('max_top1_holder_pct', global_section.get('max_top1_holder_pct', 100)),
+            max_top5_holder_pct=filters_section.get('max_top5_holder_pct', global_section.get('max_top5_holder_pct', 100)),
+            max_age_minutes=filters_section.get('max_age_minutes', global_section.get('max_age_minutes', 720)),
+            min_dex_trades_5m=filters_section.get('min_dex_trades_5m', global_section.get('min_dex_trades_5m', 5)),
+            min_volume_usd_1h=filters_section.get('min_volume_usd_1h', global_section.get('min_volume_usd_1h', 500)),
+            require_contract_verified=filters_section.get('require_contract_verified', global_section.get('require_contract_verified', False)),
+            require_owner_renounced_or_timelock=filters_section.get('require_owner_renounced_or_timelock', global_section.get('require_owner_renounced_or_timelock', False)),
+            require_mint_authority_revoked=filters_section.get('require_mint_authority_revoked', global_section.get('require_mint_authority_revoked', True)),
+        )
+        
+        # Birdeye holder enrichment is optional: needs enabled + a resolved key
+        birdeye = None
+        birdeye_section = config_data.get('data_sources', {}).get('birdeye', {})
+        birdeye_key = birdeye_section.get('api_key') or ''
+        if birdeye_section.get('enabled') and birdeye_key and '${' not in birdeye_key:
+            birdeye = BirdeyeSource(config_path)
+        
+        dex_section = config_data.get('data_sources', {}).get('dexscreener', {})
+        discovery = FeedDiscovery(cfg.chains) if dex_section.get('discovery_feeds', True) else None
+        # chain -> keyword list; chains left out use the built-in defaults
+        search_queries = dex_section.get('search_queries') or {}
+        
+        # One watchlist per chain, each polling its own tokens
+        watchlists = {}
+        watch_section = config_data.get('watchlist', {})
+        watch_settings = None
+        if watch_section.get('enabled', True):
+            watch_settings = dict(
+                fast_interval=watch_section.get('fast_interval_seconds', 30),
+                fast_window_minutes=watch_section.get('fast_window_minutes', 10),
+                slow_interval=watch_section.get('slow_interval_seconds', 300),
+            )
+            watchlists = {
+                chain: Watchlist(chain=chain, max_age_minutes=cfg.max_age_minutes, **watch_settings)
+                for chain in cfg.chains
+            }
+        
+        # Large vectorized batches can be scored in a process pool
+        executor_section = config_data.get('executor', {})
+        executor = BatchExecutor(
+            process_workers=executor_section.get('process_workers', 0),
+            min_rows=executor_section.get('min_rows', 20_000),
+        )
+        
+        scheduler = ScanScheduler(
+            interval=config_data.get('scan_interval_seconds', 60),
+            min_interval=config_data.get('scan_interval_min_seconds', 15),
+            max_interval=config_data.get('scan_interval_max_seconds', 300),
         )
         
         print(f"[SUCCESS] Loaded config from {args.config}")
@@ -289,6 +585,10 @@ if __name__ == "__main__":
     except Exception as e:
         print(f"[WARNING] Could not load config: {e}")
         print("[INFO] Using optimized defaults...\n")
+        birdeye = None
+        search_queries = {}
+        executor = BatchExecutor()
+        scheduler = ScanScheduler()
         
         cfg = FiltersConfig(
             min_liquidity_usd=3000,
@@ -303,6 +603,25 @@ if __name__ == "__main__":
             require_owner_renounced_or_timelock=False,
             require_mint_authority_revoked=True,
         )
-
-
-    asyncio.run(main(cfg))
+        discovery = FeedDiscovery(cfg.chains)
+        watch_settings = {}
+        watchlists = {chain: Watchlist(chain=chain, max_age_minutes=cfg.max_age_minutes) for chain in cfg.chains}
+
+
+    pool = None
+    if args.workers > 0:
+        # Workers build their own clients and watchlists from these settings
+        pool = ShardPool(args.workers, cfg, {
+            'config_path': str(args.config),
+            'birdeye': birdeye is not None,
+            'watchlist': watch_settings,
+        })
+        pool.start()
+        watchlists = {}
+    
+    try:
+        asyncio.run(main(cfg, birdeye, scheduler, watchlists, discovery, search_queries, pool, executor))
+    finally:
+        if pool is not None:
+            pool.stop()
+        executor.shutdown()
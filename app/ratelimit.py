@@ -0,0 +1,57 @@
+"""
+Async rate limiting shared by the upstream API clients
+Token bucket for request (or token) budgets plus an optional in-flight cap
+"""
+import asyncio
+import time
+from typing import Optional
+
+
+class AsyncRateLimiter:
+    """
+    Token bucket refilled at `rate` units per `per` seconds, holding at most
+    `burst` units, with an optional cap on concurrent holders.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        per: float = 1.0,
+        burst: Optional[float] = None,
+        max_concurrency: Optional[int] = None,
+    ):
+        self.rate = float(rate)
+        self.per = float(per)
+        self.capacity = float(burst if burst is not None else rate)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+        self._semaphore = asyncio.Semaphore(max_concurrency) if max_concurrency else None
+
+    async def wait(self, cost: float = 1.0) -> None:
+        """Block until `cost` units are available, then spend them"""
+        cost = min(float(cost), self.capacity)
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate / self.per)
+                self._updated = now
+                if self._tokens >= cost:
+                    self._tokens -= cost
+                    return
+                await asyncio.sleep((cost - self._tokens) * self.per / self.rate)
+
+    async def __aenter__(self) -> "AsyncRateLimiter":
+        if self._semaphore is not None:
+            await self._semaphore.acquire()
+        try:
+            await self.wait()
+        except BaseException:
+            if self._semaphore is not None:
+                self._semaphore.release()
+            raise
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        if self._semaphore is not None:
+            self._semaphore.release()
@@ -0,0 +1,115 @@
+"""
+Compact token records for the scan hot path
+TokenInfo (and its five nested models) is kept for API/persistence
+boundaries; the pipeline itself passes TokenRecord objects around.
+"""
+from typing import Dict, Optional, Union
+from .schemas import TokenInfo, LiquidityInfo, VolumeInfo, HolderStats, SocialInfo, CodeRisk
+
+
+class TokenRecord:
+    """Flat, __slots__-based token with explicit enrichment fields"""
+
+    __slots__ = (
+        # DexScreener pair
+        'symbol', 'name', 'chain', 'address', 'price_usd', 'liquidity_usd',
+        'volume_1h_usd', 'volume_24h_usd', 'age_minutes', 'fdv_usd', 'dex_trades_5m',
+        # Birdeye / GoPlus enrichment
+        'holder_count', 'top1_pct', 'top5_pct', 'lp_lock_ratio', 'mint_revoked',
+        'verified', 'renounced', 'buy_tax_bps', 'sell_tax_bps',
+        # CoinGecko enrichment
+        'coingecko_score', 'community_score', 'liquidity_score',
+        'twitter_followers', 'telegram_users',
+        # Scoring
+        'score_total',
+    )
+
+    def __init__(self, symbol: str, chain: str, address: str, price_usd: float = 0.0,
+                 liquidity_usd: float = 0.0, volume_1h_usd: float = 0.0, volume_24h_usd: float = 0.0,
+                 age_minutes: int = 0, fdv_usd: Optional[float] = None,
+                 dex_trades_5m: Optional[int] = None, name: Optional[str] = None):
+        self.symbol = symbol
+        self.name = name
+        self.chain = chain
+        self.address = address
+        self.price_usd = price_usd
+        self.liquidity_usd = liquidity_usd
+        self.volume_1h_usd = volume_1h_usd
+        self.volume_24h_usd = volume_24h_usd
+        self.age_minutes = age_minutes
+        self.fdv_usd = fdv_usd
+        self.dex_trades_5m = dex_trades_5m
+        self.holder_count = 0
+        self.top1_pct = 0.0
+        self.top5_pct = 0.0
+        self.lp_lock_ratio = 0.0
+        self.mint_revoked = True
+        self.verified = False
+        self.renounced = True
+        self.buy_tax_bps: Optional[int] = None
+        self.sell_tax_bps: Optional[int] = None
+        self.coingecko_score: Optional[float] = None
+        self.community_score: Optional[float] = None
+        self.liquidity_score: Optional[float] = None
+        self.twitter_followers: Optional[int] = None
+        self.telegram_users: Optional[int] = None
+        self.score_total: Optional[float] = None
+
+    def __repr__(self) -> str:
+        return f"TokenRecord({self.symbol!r}, {self.chain!r}, {self.address!r}, score={self.score_total})"
+
+    def update_market(self, other: "TokenRecord") -> None:
+        """Take the DexScreener market fields from a fresher record of the same token"""
+        self.price_usd = other.price_usd
+        self.liquidity_usd = other.liquidity_usd
+        self.volume_1h_usd = other.volume_1h_usd
+        self.volume_24h_usd = other.volume_24h_usd
+        self.age_minutes = other.age_minutes
+        self.fdv_usd = other.fdv_usd
+        self.dex_trades_5m = other.dex_trades_5m
+
+    def to_token_info(self) -> TokenInfo:
+        # Fields were typed when the record was built, so skip validation
+        return TokenInfo.model_construct(
+            symbol=self.symbol,
+            chain=self.chain,
+            address=self.address,
+            price_usd=self.price_usd,
+            liquidity=LiquidityInfo.model_construct(usd=self.liquidity_usd, lp_lock_ratio=self.lp_lock_ratio),
+            volume=VolumeInfo.model_construct(usd_1h=self.volume_1h_usd, usd_24h=self.volume_24h_usd),
+            holders=HolderStats.model_construct(holder_count=self.holder_count, top1_pct=self.top1_pct, top5_pct=self.top5_pct),
+            socials=SocialInfo.model_construct(
+                telegram_followers=self.telegram_users or 0,
+                twitter_followers=self.twitter_followers or 0,
+            ),
+            code_risk=CodeRisk.model_construct(verified=self.verified, mint_revoked=self.mint_revoked, renounced=self.renounced),
+            age_minutes=self.age_minutes,
+            fdv_usd=self.fdv_usd,
+            buy_tax_bps=self.buy_tax_bps,
+            sell_tax_bps=self.sell_tax_bps,
+            dex_trades_5m=self.dex_trades_5m,
+            score_total=self.score_total,
+        )
+
+    def to_dict(self) -> Dict:
+        """Dict shape read by the logger, momentum tracker and Telegram alerts"""
+        return {
+            'name': self.name or self.symbol,
+            'symbol': self.symbol,
+            'chain': self.chain,
+            'address': self.address,
+            'price_usd': self.price_usd,
+            'score': self.score_total,
+            'liquidity': {'usd': self.liquidity_usd, 'lp_lock_ratio': self.lp_lock_ratio},
+            'volume': {'h1': self.volume_1h_usd, 'h24': self.volume_24h_usd},
+            'holders': self.holder_count or 'N/A',
+            'lp_lock': round(self.lp_lock_ratio * 100, 1),
+            'age_minutes': self.age_minutes,
+            'fdv_usd': self.fdv_usd,
+            'coingecko_score': self.coingecko_score,
+            'link': f"https://dexscreener.com/{self.chain}/{self.address}",
+        }
+
+
+# Pipeline stages accept either representation
+AnyToken = Union[TokenInfo, TokenRecord]
@@ -0,0 +1,288 @@
+"""
+Record/replay of upstream HTTP traffic for network-free runs
+A tape is gzip-compressed JSON lines, one exchange per line:
+    {"method", "url", "status", "headers", "body" (base64), "elapsed"}
+Recording wraps the real transport and appends every exchange; replay
+serves the tape back with configurable latency and injected errors.
+
+Both modes are switched on through the environment, so shard/executor
+worker processes pick them up too:
+    SCOUT_HTTP_RECORD=tapes/scan.jsonl.gz           record live traffic
+    SCOUT_HTTP_REPLAY=tapes/scan.jsonl.gz           serve it back
+    SCOUT_REPLAY_LATENCY=0.05   (seconds, or "recorded" for the original timings)
+    SCOUT_REPLAY_JITTER=0.02
+    SCOUT_REPLAY_ERROR_RATE=0.01
+    SCOUT_REPLAY_ERROR_STATUS=503
+    SCOUT_REPLAY_SEED=1
+pooled httpx clients (make_async_client) and the CoinGecko requests
+session are hooked; see async_transport() and mount_requests(). The
+Ethereum scanner is not: its web3 JSON-RPC posts cannot be keyed by URL,
+so it refuses to run while either mode is on (see check_untaped()).
+"""
+import asyncio
+import atexit
+import base64
+import gzip
+import json
+import os
+import random
+import threading
+import time
+from collections import defaultdict
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+import httpx
+
+# Recorded bodies are buffered and written as one gzip member per flush
+FLUSH_EVERY = 50
+
+# Query parameters carrying credentials; never written to a tape
+SECRET_PARAMS = {"apikey", "api_key", "key", "x_cg_demo_api_key", "x_cg_pro_api_key"}
+
+
+def tape_url(url: str) -> str:
+    """
+    URL as stored on (and looked up in) a tape: credentials blanked, query
+    sorted so httpx and requests spellings of one request match
+    """
+    parts = urlsplit(url)
+    if not parts.query:
+        return url
+    query = sorted((k, "REDACTED" if k.lower() in SECRET_PARAMS else v)
+                   for k, v in parse_qsl(parts.query, keep_blank_values=True))
+    return urlunsplit(parts._replace(query=urlencode(query)))
+
+
+class Tape:
+    """Append-only writer / indexed reader for a tape file"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._buffer: List[str] = []
+        self._lock = threading.Lock()
+
+    def append(self, method: str, url: str, status: int, headers: Dict[str, str],
+               body: bytes, elapsed: float) -> None:
+        line = json.dumps({
+            "method": method, "url": tape_url(url), "status": status, "headers": headers,
+            "body": base64.b64encode(body).decode("ascii"), "elapsed": round(elapsed, 4),
+        })
+        with self._lock:
+            self._buffer.append(line)
+            if len(self._buffer) >= FLUSH_EVERY:
+                self._flush_locked()
+
+    def flush(self) -> None:
+        with self._lock:
+            self._flush_locked()
+
+    def _flush_locked(self) -> None:
+        if not self._buffer:
+            return
+        data = gzip.compress(("\n".join(self._buffer) + "\n").encode())
+        self._buffer = []
+        # One write of a complete gzip member per flush: several processes
+        # can append to the same tape and it stays readable
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        fd = os.open(self.path, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+        try:
+            os.write(fd, data)
+        finally:
+            os.close(fd)
+
+    def load(self) -> Dict[Tuple[str, str], List[dict]]:
+        """(method, url) -> recorded exchanges in order"""
+        index: Dict[Tuple[str, str], List[dict]] = defaultdict(list)
+        with gzip.open(self.path, "rt") as f:
+            for line in f:
+                if line.strip():
+                    entry = json.loads(line)
+                    index[(entry["method"], tape_url(entry["url"]))].append(entry)
+        return index
+
+
+def _response_headers(headers) -> Dict[str, str]:
+    # The body is stored decoded, so its transfer headers no longer apply
+    skip = {"content-encoding", "content-length", "transfer-encoding", "connection"}
+    return {k: v for k, v in headers.items() if k.lower() not in skip}
+
+
+class RecordingTransport(httpx.AsyncBaseTransport):
+    """Pass requests to the real transport and write each exchange to the tape"""
+
+    def __init__(self, tape: Tape, inner: Optional[httpx.AsyncBaseTransport] = None):
+        self.tape = tape
+        self.inner = inner or httpx.AsyncHTTPTransport()
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        start = time.perf_counter()
+        response = await self.inner.handle_async_request(request)
+        body = await response.aread()
+        await response.aclose()
+        headers = _response_headers(response.headers)
+        self.tape.append(request.method, str(request.url), response.status_code, headers,
+                         body, time.perf_counter() - start)
+        return httpx.Response(response.status_code, headers=headers, content=body, request=request)
+
+    async def aclose(self) -> None:
+        await self.inner.aclose()
+
+
+class ReplayTransport(httpx.AsyncBaseTransport):
+    """
+    Serve recorded exchanges. Repeated requests for one URL walk through
+    its recordings in order and stay on the last one; unrecorded URLs get
+    a 404. latency=None replays the recorded timings.
+    """
+
+    def __init__(self, tape: Tape, latency: Optional[float] = 0.0, jitter: float = 0.0,
+                 error_rate: float = 0.0, error_status: int = 503, seed: Optional[int] = None):
+        self.index = tape.load()
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.rng = random.Random(seed)
+        self._cursor: Dict[Tuple[str, str], int] = defaultdict(int)
+        self.stats = {"served": 0, "missed": 0, "injected": 0}
+
+    def next_entry(self, method: str, url: str) -> Tuple[Optional[dict], float]:
+        """The recording to serve and how long to wait before serving it"""
+        key = (method, tape_url(url))
+        entries = self.index.get(key)
+        entry = None
+        if entries:
+            i = self._cursor[key]
+            entry = entries[min(i, len(entries) - 1)]
+            self._cursor[key] = i + 1
+        if self.latency is None:
+            delay = entry["elapsed"] if entry else 0.0
+        else:
+            delay = self.latency
+        if self.jitter:
+            delay += self.rng.uniform(0, self.jitter)
+        return entry, delay
+
+    def build(self, entry: Optional[dict]) -> Tuple[int, Dict[str, str], bytes]:
+        if self.error_rate and self.rng.random() < self.error_rate:
+            self.stats["injected"] += 1
+            return self.error_status, {"content-type": "application/json"}, b'{"error": "injected"}'
+        if entry is None:
+            self.stats["missed"] += 1
+            return 404, {"content-type": "application/json"}, b'{"error": "not recorded"}'
+        self.stats["served"] += 1
+        return entry["status"], entry["headers"], base64.b64decode(entry["body"])
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        entry, delay = self.next_entry(request.method, str(request.url))
+        if delay > 0:
+            await asyncio.sleep(delay)
+        status, headers, body = self.build(entry)
+        return httpx.Response(status, headers=headers, content=body, request=request)
+
+
+# ---------------------------------------------------------------
+# Environment-driven hooks
+# ---------------------------------------------------------------
+_tapes: Dict[str, Tape] = {}
+_replay: Optional[ReplayTransport] = None
+
+
+def _tape(path: str) -> Tape:
+    if path not in _tapes:
+        _tapes[path] = Tape(path)
+        atexit.register(_tapes[path].flush)
+    return _tapes[path]
+
+
+def flush() -> None:
+    """Write out buffered recordings (worker processes skip atexit)"""
+    for tape in _tapes.values():
+        tape.flush()
+
+
+def mode() -> Optional[str]:
+    if os.getenv("SCOUT_HTTP_REPLAY"):
+        return "replay"
+    if os.getenv("SCOUT_HTTP_RECORD"):
+        return "record"
+    return None
+
+
+def check_untaped(what: str) -> None:
+    """Refuse traffic the tape cannot hold, rather than record a partial tape or hit the network"""
+    current = mode()
+    if current is not None:
+        raise RuntimeError(f"{what} cannot run under HTTP {current}: its requests bypass the tape")
+
+
+def get_replay() -> ReplayTransport:
+    """The process-wide replay transport (one cursor per URL across clients)"""
+    global _replay
+    if _replay is None:
+        latency = os.getenv("SCOUT_REPLAY_LATENCY", "0")
+        seed = os.getenv("SCOUT_REPLAY_SEED")
+        _replay = ReplayTransport(
+            _tape(os.environ["SCOUT_HTTP_REPLAY"]),
+            latency=None if latency == "recorded" else float(latency),
+            jitter=float(os.getenv("SCOUT_REPLAY_JITTER", "0")),
+            error_rate=float(os.getenv("SCOUT_REPLAY_ERROR_RATE", "0")),
+            error_status=int(os.getenv("SCOUT_REPLAY_ERROR_STATUS", "503")),
+            seed=int(seed) if seed else None,
+        )
+    return _replay
+
+
+def async_transport(limits: Optional[httpx.Limits] = None) -> Optional[httpx.AsyncBaseTransport]:
+    """Transport for a new AsyncClient, or None outside record/replay"""
+    current = mode()
+    if current == "replay":
+        return get_replay()
+    if current == "record":
+        inner = httpx.AsyncHTTPTransport(limits=limits) if limits else None
+        return RecordingTransport(_tape(os.environ["SCOUT_HTTP_RECORD"]), inner)
+    return None
+
+
+def mount_requests(session) -> None:
+    """Route a requests.Session (pycoingecko) through the same tape"""
+    current = mode()
+    if current is None:
+        return
+    import requests
+    from requests.adapters import BaseAdapter, HTTPAdapter
+
+    def to_requests(request, status: int, headers: Dict[str, str], body: bytes):
+        response = requests.Response()
+        response.status_code = status
+        response.headers.update(headers)
+        response._content = body
+        response.url = request.url
+        response.request = request
+        return response
+
+    class RecordingAdapter(HTTPAdapter):
+        def send(self, request, **kwargs):
+            start = time.perf_counter()
+            response = super().send(request, **kwargs)
+            headers = _response_headers(response.headers)
+            _tape(os.environ["SCOUT_HTTP_RECORD"]).append(
+                request.method, request.url, response.status_code, headers,
+                response.content, time.perf_counter() - start)
+            return response
+
+    class ReplayAdapter(BaseAdapter):
+        def send(self, request, **kwargs):
+            replay = get_replay()
+            entry, delay = replay.next_entry(request.method, request.url)
+            if delay > 0:
+                time.sleep(delay)
+            return to_requests(request, *replay.build(entry))
+
+        def close(self):
+            pass
+
+    adapter = ReplayAdapter() if current == "replay" else RecordingAdapter()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
@@ -0,0 +1,71 @@
+"""
+Adaptive scan cadence for the main loop
+Intervals are measured start-to-start, so a slow scan eats into the wait
+instead of being added to it.
+"""
+import asyncio
+import time
+from typing import Optional
+
+
+class ScanScheduler:
+    """
+    Starts from `interval` seconds and adapts after each scan:
+      - upstream 429s or a failed scan: back off (x2, up to max_interval)
+      - new listings well above the recent average: tighten (x0.5, down to min_interval)
+      - nothing new: stretch gently (x1.25)
+      - otherwise drift back toward the configured interval
+    """
+
+    def __init__(
+        self,
+        interval: float = 60,
+        min_interval: float = 15,
+        max_interval: float = 300,
+        spike_ratio: float = 2.0,
+        smoothing: float = 0.3,
+    ):
+        self.base_interval = float(interval)
+        self.min_interval = float(min(min_interval, interval))
+        self.max_interval = float(max(max_interval, interval))
+        self.spike_ratio = spike_ratio
+        self.smoothing = smoothing
+        self.interval = self.base_interval
+        self.avg_new: Optional[float] = None
+        self._started = time.monotonic()
+
+    def copy(self) -> "ScanScheduler":
+        """A fresh scheduler with the same settings (one per independent loop)"""
+        return ScanScheduler(self.base_interval, self.min_interval, self.max_interval,
+                             self.spike_ratio, self.smoothing)
+
+    def start(self) -> None:
+        """Mark the start of a scan"""
+        self._started = time.monotonic()
+
+    def record(self, new_count: int = 0, throttled: int = 0, error: bool = False) -> float:
+        """Adapt the interval from this scan's outcome; returns the new interval"""
+        if error or throttled:
+            self.interval *= 2
+        elif self.avg_new is not None and new_count > max(1.0, self.avg_new) * self.spike_ratio:
+            self.interval *= 0.5
+        elif new_count == 0:
+            self.interval *= 1.25
+        else:
+            self.interval += (self.base_interval - self.interval) * 0.5
+
+        if not error:
+            if self.avg_new is None:
+                self.avg_new = float(new_count)
+            else:
+                self.avg_new += (new_count - self.avg_new) * self.smoothing
+
+        self.interval = min(self.max_interval, max(self.min_interval, self.interval))
+        return self.interval
+
+    def delay(self) -> float:
+        """Seconds left until the next scan should start"""
+        return max(0.0, self.interval - (time.monotonic() - self._started))
+
+    async def wait(self) -> None:
+        await asyncio.sleep(self.delay())
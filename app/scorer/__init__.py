@@ -1,9 +1,9 @@
-from ..schemas import TokenInfo
+from ..records import AnyToken, TokenRecord
 
 
-def score_tokens(token: TokenInfo):
+def score_tokens(token: AnyToken):
     """
-    Assigns a score_total to a TokenInfo object (0–100) based on:
+    Assigns a score_total to a TokenInfo or TokenRecord (0–100) based on:
     - liquidity
     - 1h volume
     - age
@@ -12,7 +12,8 @@ def score_tokens(token: TokenInfo):
         score = 0
 
         # --- Liquidity weight ---
-        liq = token.liquidity.usd
+        flat = isinstance(token, TokenRecord)
+        liq = token.liquidity_usd if flat else token.liquidity.usd
         if liq > 100_000:
             score += 40
         elif liq > 25_000:
@@ -21,7 +22,7 @@ def score_tokens(token: TokenInfo):
             score += 10
 
         # --- 1h Volume weight ---
-        vol = token.volume.usd_1h
+        vol = token.volume_1h_usd if flat else token.volume.usd_1h
         if vol > 100_000:
             score += 30
         elif vol > 25_000:
@@ -0,0 +1,249 @@
+"""
+Multi-process sharded scanning
+The parent process keeps discovery (searches, feeds, phase-one filters);
+N worker processes each own a crc32 partition of token addresses and run
+enrichment, scoring, logging, alerts and the momentum watchlist for it.
+Parent and workers talk over multiprocessing queues only. Upstream rate
+budgets are split between the processes: DexScreener's per-IP budget
+between the parent and the workers' watchlists, CoinGecko's and Birdeye's
+across the workers.
+"""
+import asyncio
+import itertools
+import multiprocessing as mp
+import queue
+import threading
+import zlib
+from typing import Dict, List, Optional, Tuple
+
+from . import replay
+from .data_sources import dexscreener
+from .records import TokenRecord
+from .schemas import FiltersConfig
+
+
+# Of the per-IP DexScreener budget, the parent keeps this much for its
+# searches and feed discovery; the workers' watchlist re-polls split the rest
+PARENT_DEXSCREENER_SHARE = 0.5
+
+
+def shard_of(address: str, shards: int) -> int:
+    """Stable shard for an address (same in every process, unlike hash())"""
+    return zlib.crc32(address.encode()) % shards
+
+
+def dexscreener_shares(workers: int, settings: Dict) -> Tuple[float, float]:
+    """(parent, per-worker) fractions of the per-IP DexScreener budget"""
+    if settings.get('watchlist') is None:
+        # Enrichment alone never calls DexScreener
+        return 1.0, 0.0
+    return PARENT_DEXSCREENER_SHARE, (1 - PARENT_DEXSCREENER_SHARE) / workers
+
+
+def _worker_main(shard_id: int, workers: int, cfg: FiltersConfig, settings: Dict, inbox, outbox) -> None:
+    """Process entry point: serve ("process", request_id, chain, records) until None"""
+    asyncio.run(_worker_loop(shard_id, workers, cfg, settings, inbox, outbox))
+
+
+async def _worker_loop(shard_id: int, workers: int, cfg: FiltersConfig, settings: Dict, inbox, outbox) -> None:
+    # Imported here so the parent does not pay for it twice
+    from .main import process_token, watch_tokens
+    from .coingecko_client import CoinGeckoClient, RATE_LIMIT_DELAY
+    from .data_sources.birdeye import BirdeyeSource
+    from .watchlist import Watchlist
+
+    loop = asyncio.get_running_loop()
+    _, dexscreener_share = dexscreener_shares(workers, settings)
+    if dexscreener_share > 0:
+        dexscreener.set_budget_share(dexscreener_share)
+    coingecko = CoinGeckoClient(budget_share=1 / workers,
+                                rate_limit_delay=settings.get('coingecko_delay', RATE_LIMIT_DELAY))
+    birdeye = BirdeyeSource(settings['config_path'], budget_share=1 / workers) if settings.get('birdeye') else None
+
+    watchlists = {}
+    watch = settings.get('watchlist')
+    if watch is not None:
+        watchlists = {chain: Watchlist(chain=chain, max_age_minutes=cfg.max_age_minutes, **watch)
+                      for chain in cfg.chains}
+    # Held so the background tasks are not garbage-collected mid-run
+    watch_tasks = [asyncio.create_task(watch_tokens(w, coingecko)) for w in watchlists.values()]
+
+    print(f"[shard {shard_id}] ready")
+    while True:
+        message = await loop.run_in_executor(None, inbox.get)
+        if message is None:
+            break
+        _, request_id, chain, records = message
+        try:
+            results = await asyncio.gather(*(process_token(t, cfg, coingecko, birdeye) for t in records))
+            processed = [t for t in results if t is not None]
+            if chain in watchlists:
+                for t in processed:
+                    watchlists[chain].add(t)
+            outbox.put((request_id, shard_id, processed, None))
+        except Exception as e:
+            print(f"[shard {shard_id}] batch failed: {e}")
+            outbox.put((request_id, shard_id, [], f"{type(e).__name__}: {e}"))
+
+    for task in watch_tasks:
+        task.cancel()
+    if birdeye is not None:
+        await birdeye.aclose()
+    replay.flush()
+
+
+class ShardPool:
+    """Worker processes that each enrich the addresses of one crc32 shard"""
+
+    def __init__(self, workers: int, cfg: FiltersConfig, settings: Optional[Dict] = None,
+                 timeout: float = 300, health_interval: float = 1.0):
+        self.workers = workers
+        self.cfg = cfg
+        self.settings = settings or {}
+        self.timeout = timeout
+        self.health_interval = health_interval
+        # spawn: workers must not inherit the parent's event loop or sockets
+        self._ctx = mp.get_context("spawn")
+        self._inboxes = []
+        self._outbox = None
+        self._processes = []
+        # request_id -> [future, shards still owing a result, collected records]
+        self._pending: Dict[int, list] = {}
+        # Guards _inboxes/_processes: the collector thread respawns workers
+        self._lock = threading.Lock()
+        self._ids = itertools.count()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._collector: Optional[threading.Thread] = None
+        self._stopping = False
+
+    def _spawn(self, shard_id: int) -> None:
+        inbox = self._ctx.Queue()
+        process = self._ctx.Process(
+            target=_worker_main,
+            args=(shard_id, self.workers, self.cfg, self.settings, inbox, self._outbox),
+            name=f"scout-shard-{shard_id}",
+            daemon=True,
+        )
+        process.start()
+        self._inboxes[shard_id] = inbox
+        self._processes[shard_id] = process
+
+    def start(self) -> None:
+        self._stopping = False
+        self._outbox = self._ctx.Queue()
+        with self._lock:
+            self._inboxes = [None] * self.workers
+            self._processes = [None] * self.workers
+            for shard_id in range(self.workers):
+                self._spawn(shard_id)
+        dexscreener.set_budget_share(dexscreener_shares(self.workers, self.settings)[0])
+
+    def stop(self, timeout: float = 10) -> None:
+        with self._lock:
+            self._stopping = True
+        for inbox in self._inboxes:
+            inbox.put(None)
+        for process in self._processes:
+            process.join(timeout)
+            if process.is_alive():
+                process.terminate()
+        if self._outbox is not None:
+            self._outbox.put(None)
+        if self._collector is not None:
+            self._collector.join(timeout)
+            self._collector = None
+        self._inboxes, self._processes = [], []
+        dexscreener.set_budget_share(1.0)
+
+    def _collect(self) -> None:
+        # Blocking reads stay on this thread; results hop back onto the loop
+        while True:
+            try:
+                message = self._outbox.get(timeout=self.health_interval)
+            except queue.Empty:
+                message = ()
+            except (EOFError, OSError) as e:
+                self._call(self._fail_all, RuntimeError(f"shard result queue closed: {e}"))
+                break
+            if message is None:
+                break
+            if message:
+                self._call(self._on_result, *message)
+            self._check_workers()
+
+    def _call(self, fn, *args) -> None:
+        """Run fn on the event loop thread, which owns the futures"""
+        try:
+            self._loop.call_soon_threadsafe(fn, *args)
+        except RuntimeError:
+            # The loop has closed: nobody is waiting any more
+            pass
+
+    def _check_workers(self) -> None:
+        with self._lock:
+            if self._stopping:
+                return
+            dead = [(shard_id, p) for shard_id, p in enumerate(self._processes) if not p.is_alive()]
+            for shard_id, process in dead:
+                print(f"[shard {shard_id}] worker exited with code {process.exitcode}; restarting")
+                # Batches sent from now on reach the new worker
+                self._spawn(shard_id)
+        for shard_id, process in dead:
+            self._call(self._fail_shard, shard_id,
+                       RuntimeError(f"shard worker {shard_id} exited with code {process.exitcode}"))
+
+    def _fail_shard(self, shard_id: int, error: Exception) -> None:
+        """Fail the batches still waiting on one shard; the others carry on"""
+        for request_id, (future, remaining, _) in list(self._pending.items()):
+            if shard_id in remaining:
+                del self._pending[request_id]
+                if not future.done():
+                    future.set_exception(error)
+
+    def _fail_all(self, error: Exception) -> None:
+        pending, self._pending = self._pending, {}
+        for future, _, _ in pending.values():
+            if not future.done():
+                future.set_exception(error)
+
+    def _on_result(self, request_id: int, shard_id: int, processed: List[TokenRecord],
+                   error: Optional[str] = None) -> None:
+        entry = self._pending.get(request_id)
+        if entry is None:
+            return
+        future, remaining, collected = entry
+        if error is not None:
+            del self._pending[request_id]
+            if not future.done():
+                future.set_exception(RuntimeError(f"shard {shard_id}: {error}"))
+            return
+        collected.extend(processed)
+        remaining.discard(shard_id)
+        if not remaining:
+            del self._pending[request_id]
+            if not future.done():
+                future.set_result(collected)
+
+    async def process(self, chain: str, records: List[TokenRecord]) -> List[TokenRecord]:
+        """Partition records by address, run them on their shards, gather the survivors"""
+        if not records:
+            return []
+        if self._collector is None:
+            self._loop = asyncio.get_running_loop()
+            self._collector = threading.Thread(target=self._collect, name="scout-shard-collector", daemon=True)
+            self._collector.start()
+
+        parts: Dict[int, List[TokenRecord]] = {}
+        for t in records:
+            parts.setdefault(shard_of(t.address, self.workers), []).append(t)
+
+        request_id = next(self._ids)
+        future = self._loop.create_future()
+        self._pending[request_id] = [future, set(parts), []]
+        with self._lock:
+            for shard_id, part in parts.items():
+                self._inboxes[shard_id].put(("process", request_id, chain, part))
+        try:
+            return await asyncio.wait_for(future, self.timeout)
+        finally:
+            self._pending.pop(request_id, None)
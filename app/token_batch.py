@@ -0,0 +1,204 @@
+"""
+Columnar container for whole-scan operations
+One TokenBatch holds every pair of a DexScreener response as NumPy columns,
+so filtering, scoring, sorting and top-k run vectorized instead of per
+object. Survivors are materialized as TokenRecords for enrichment.
+"""
+import time
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+
+from .schemas import FiltersConfig
+from .records import TokenRecord
+
+# Numeric columns; NaN marks "unknown" for enrichment-only fields
+FLOAT_COLUMNS = (
+    'price_usd', 'liquidity_usd', 'volume_1h_usd', 'volume_24h_usd', 'fdv_usd',
+    'top1_pct', 'top5_pct', 'buy_tax_bps', 'sell_tax_bps', 'score_total',
+)
+INT_COLUMNS = ('age_minutes', 'trades_5m', 'holder_count')
+STRING_COLUMNS = ('address', 'symbol', 'name')
+
+
+def score_columns(liq: np.ndarray, vol: np.ndarray, age: np.ndarray) -> np.ndarray:
+    """scorer.score_tokens over whole columns (pure, so it can run in a worker process)"""
+    score = (
+        np.select([liq > 100_000, liq > 25_000, liq > 5_000], [40, 25, 10], 0)
+        + np.select([vol > 100_000, vol > 25_000, vol > 5_000], [30, 20, 10], 0)
+        + np.select([age < 10, age < 60], [20, 10], 0)
+    )
+    return np.minimum(score, 100).astype(np.float64)
+
+
+class TokenBatch:
+    """Struct-of-arrays view of a scan's tokens, all columns the same length"""
+
+    def __init__(self, chain: str, columns: Dict[str, np.ndarray]):
+        self.chain = chain
+        self.columns = columns
+
+    def __len__(self) -> int:
+        return len(self.columns['address'])
+
+    def __getattr__(self, name: str) -> np.ndarray:
+        try:
+            return self.__dict__['columns'][name]
+        except KeyError:
+            raise AttributeError(name) from None
+
+    # ---------------------------------------------------------------
+    # Construction
+    # ---------------------------------------------------------------
+    @classmethod
+    def from_pairs(cls, pairs: Iterable[dict], chain: str = "solana",
+                   now_ms: Optional[int] = None) -> "TokenBatch":
+        """Build once from raw DexScreener pairs; drops pairs without an address or creation time"""
+        if now_ms is None:
+            now_ms = int(time.time() * 1000)
+        rows: Dict[str, list] = {c: [] for c in FLOAT_COLUMNS + INT_COLUMNS + STRING_COLUMNS}
+        created = []
+
+        for p in pairs:
+            base = p.get("baseToken") or {}
+            address = base.get("address")
+            created_ms = p.get("pairCreatedAt")
+            if not address or not created_ms:
+                continue
+            volume = p.get("volume") or {}
+            txns = p.get("txns") or {}
+            txns_5m = txns.get("m5") or txns.get("h1") or {}
+            rows['address'].append(address)
+            rows['symbol'].append(base.get("symbol") or "UNKNOWN")
+            rows['name'].append(base.get("name"))
+            rows['price_usd'].append(float(p.get("priceUsd") or 0))
+            rows['liquidity_usd'].append(float((p.get("liquidity") or {}).get("usd") or 0))
+            rows['volume_1h_usd'].append(float(volume.get("h1") or 0))
+            rows['volume_24h_usd'].append(float(volume.get("h24") or 0))
+            rows['fdv_usd'].append(float(p.get("fdv") or 0))
+            rows['trades_5m'].append(int(txns_5m.get("buys", 0)) + int(txns_5m.get("sells", 0)))
+            created.append(int(created_ms))
+
+        n = len(created)
+        columns: Dict[str, np.ndarray] = {}
+        for c in FLOAT_COLUMNS:
+            columns[c] = np.array(rows[c], dtype=np.float64) if rows[c] else np.full(n, np.nan)
+        columns['age_minutes'] = ((now_ms - np.array(created, dtype=np.int64)) / 60_000).astype(np.int64)
+        columns['trades_5m'] = np.array(rows['trades_5m'], dtype=np.int64)
+        columns['holder_count'] = np.zeros(n, dtype=np.int64)
+        for c in STRING_COLUMNS:
+            columns[c] = np.array(rows[c], dtype=object)
+        return cls(chain, columns)
+
+    @classmethod
+    def from_records(cls, records: List[TokenRecord], chain: str = "solana") -> "TokenBatch":
+        """Columnar view of enriched records (e.g. for ranking a scan's results)"""
+        def col(attr, dtype, unknown=None):
+            values = [getattr(r, attr) for r in records]
+            if unknown is not None:
+                values = [unknown if v is None else v for v in values]
+            return np.array(values, dtype=dtype)
+
+        columns = {
+            'price_usd': col('price_usd', np.float64),
+            'liquidity_usd': col('liquidity_usd', np.float64),
+            'volume_1h_usd': col('volume_1h_usd', np.float64),
+            'volume_24h_usd': col('volume_24h_usd', np.float64),
+            'fdv_usd': col('fdv_usd', np.float64, 0.0),
+            'top1_pct': col('top1_pct', np.float64),
+            'top5_pct': col('top5_pct', np.float64),
+            'buy_tax_bps': col('buy_tax_bps', np.float64, np.nan),
+            'sell_tax_bps': col('sell_tax_bps', np.float64, np.nan),
+            'score_total': col('score_total', np.float64, np.nan),
+            'age_minutes': col('age_minutes', np.int64),
+            'trades_5m': col('dex_trades_5m', np.int64, 0),
+            'holder_count': col('holder_count', np.int64),
+            'address': col('address', object),
+            'symbol': col('symbol', object),
+            'name': col('name', object),
+        }
+        return cls(chain, columns)
+
+    def exclude(self, addresses) -> "TokenBatch":
+        """Drop rows whose address is in `addresses` (e.g. already processed)"""
+        if not addresses or not len(self):
+            return self
+        return self.take(np.fromiter((a not in addresses for a in self.columns['address']), dtype=bool, count=len(self)))
+
+    def take(self, index) -> "TokenBatch":
+        """Row subset by boolean mask or integer index array"""
+        return TokenBatch(self.chain, {c: v[index] for c, v in self.columns.items()})
+
+    # ---------------------------------------------------------------
+    # Vectorized stages
+    # ---------------------------------------------------------------
+    def pre_filter_mask(self, cfg: FiltersConfig) -> np.ndarray:
+        """Same rules as filters.filter_pre_enrichment, for every row at once"""
+        c = self.columns
+        mask = (
+            (c['liquidity_usd'] > 0)
+            & (c['price_usd'] >= cfg.min_price_usd) & (c['price_usd'] <= cfg.max_price_usd)
+            & (c['liquidity_usd'] >= cfg.min_liquidity_usd) & (c['liquidity_usd'] <= cfg.max_liquidity_usd)
+            & (c['age_minutes'] >= max(cfg.min_age_minutes, 0))
+            & (c['age_minutes'] <= cfg.max_age_minutes)
+            & ((c['fdv_usd'] <= 0) | (c['fdv_usd'] <= cfg.max_fdv_usd))
+        )
+        if cfg.min_dex_trades_5m > 0:
+            mask &= c['trades_5m'] >= cfg.min_dex_trades_5m
+        if cfg.min_volume_usd_1h > 0:
+            mask &= c['volume_1h_usd'] >= cfg.min_volume_usd_1h
+        return mask
+
+    def filter(self, cfg: FiltersConfig) -> "TokenBatch":
+        return self.take(self.pre_filter_mask(cfg))
+
+    def score(self) -> np.ndarray:
+        """Vectorized scorer.score_tokens; fills and returns the score_total column"""
+        c = self.columns
+        c['score_total'] = score_columns(c['liquidity_usd'], c['volume_1h_usd'], c['age_minutes'])
+        return c['score_total']
+
+    def argsort(self, by: str = 'score_total', descending: bool = True) -> np.ndarray:
+        values = self.columns[by]
+        # NaN sorts last either way
+        order = np.argsort(-values if descending else values, kind='stable')
+        return order
+
+    def sort(self, by: str = 'score_total', descending: bool = True) -> "TokenBatch":
+        return self.take(self.argsort(by, descending))
+
+    def argtop_k(self, k: int, by: str = 'score_total', descending: bool = True) -> np.ndarray:
+        """Indices of the k best rows, best first; O(n) selection then a k-sized sort"""
+        n = len(self)
+        if k >= n:
+            return self.argsort(by, descending)
+        values = self.columns[by]
+        keys = -values if descending else values
+        keys = np.where(np.isnan(keys), np.inf, keys)
+        part = np.argpartition(keys, k)[:k]
+        return part[np.argsort(keys[part], kind='stable')]
+
+    # ---------------------------------------------------------------
+    # Materialization
+    # ---------------------------------------------------------------
+    def to_records(self) -> List[TokenRecord]:
+        c = self.columns
+        records = []
+        for i in range(len(self)):
+            r = TokenRecord(
+                symbol=c['symbol'][i],
+                name=c['name'][i],
+                chain=self.chain,
+                address=c['address'][i],
+                price_usd=float(c['price_usd'][i]),
+                liquidity_usd=float(c['liquidity_usd'][i]),
+                volume_1h_usd=float(c['volume_1h_usd'][i]),
+                volume_24h_usd=float(c['volume_24h_usd'][i]),
+                age_minutes=int(c['age_minutes'][i]),
+                fdv_usd=float(c['fdv_usd'][i]),
+                dex_trades_5m=int(c['trades_5m'][i]),
+            )
+            if not np.isnan(c['score_total'][i]):
+                r.score_total = float(c['score_total'][i])
+            records.append(r)
+        return records
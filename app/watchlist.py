@@ -0,0 +1,116 @@
+"""
+Watchlist of tracked tokens, re-polled at a decaying frequency
+Fresh tokens are polled every fast_interval seconds for their first
+fast_window_minutes on the list, then every slow_interval seconds until the
+pair is older than max_age_minutes.
+"""
+import asyncio
+import time
+from typing import Dict, List, Optional
+
+from .records import TokenRecord
+from .data_sources.dexscreener import fetch_pairs_by_tokens
+
+
+class WatchEntry:
+    __slots__ = ('record', 'added_at', 'next_poll', 'alerted', 'coingecko_at')
+
+    def __init__(self, record: TokenRecord, now: float):
+        self.record = record
+        self.added_at = now
+        self.next_poll = now
+        self.alerted = False
+        # The scan that added the record already fetched its coin document
+        self.coingecko_at = now
+
+
+class Watchlist:
+    """Tokens added after processing, re-polled for fresh market data while young"""
+
+    def __init__(
+        self,
+        chain: str = "solana",
+        fast_interval: float = 30,
+        fast_window_minutes: float = 10,
+        slow_interval: float = 300,
+        max_age_minutes: int = 720,
+    ):
+        self.chain = chain
+        self.fast_interval = fast_interval
+        self.fast_window = fast_window_minutes * 60
+        self.slow_interval = slow_interval
+        self.max_age_minutes = max_age_minutes
+        self.entries: Dict[str, WatchEntry] = {}
+        # Set by add() so a waiting poll loop reschedules for the new entry
+        self._added = asyncio.Event()
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def __contains__(self, address: str) -> bool:
+        return address in self.entries
+
+    def add(self, record: TokenRecord, now: Optional[float] = None) -> None:
+        if record.address in self.entries:
+            return
+        now = time.monotonic() if now is None else now
+        entry = WatchEntry(record, now)
+        # First re-poll one interval after the sighting that added it
+        entry.next_poll = now + self.fast_interval
+        self.entries[record.address] = entry
+        self._added.set()
+
+    def interval_for(self, entry: WatchEntry, now: float) -> float:
+        if now - entry.added_at < self.fast_window:
+            return self.fast_interval
+        return self.slow_interval
+
+    def due(self, now: Optional[float] = None) -> List[str]:
+        now = time.monotonic() if now is None else now
+        return [a for a, e in self.entries.items() if e.next_poll <= now]
+
+    def next_due_in(self, now: Optional[float] = None) -> float:
+        """Seconds until the earliest entry is due (fast_interval when empty)"""
+        if not self.entries:
+            return self.fast_interval
+        now = time.monotonic() if now is None else now
+        return max(0.0, min(e.next_poll for e in self.entries.values()) - now)
+
+    async def wait_due(self) -> None:
+        """Sleep until the earliest entry is due, or until an entry is added"""
+        self._added.clear()
+        try:
+            await asyncio.wait_for(self._added.wait(), self.next_due_in())
+        except asyncio.TimeoutError:
+            pass
+
+    async def poll(self, now: Optional[float] = None) -> List[WatchEntry]:
+        """
+        Refresh every due token in multi-address batches and reschedule it.
+        Returns the entries whose records got fresh market data; tokens past
+        max_age_minutes (or gone from DexScreener that long) are dropped.
+        """
+        now = time.monotonic() if now is None else now
+        addresses = self.due(now)
+        if not addresses:
+            return []
+
+        best = await fetch_pairs_by_tokens(addresses, self.chain)
+
+        refreshed = []
+        for address in addresses:
+            entry = self.entries[address]
+            fresh = best.get(address)
+            if fresh is not None:
+                entry.record.update_market(fresh)
+                if fresh.age_minutes > self.max_age_minutes:
+                    del self.entries[address]
+                    continue
+                refreshed.append(entry)
+            elif now - entry.added_at > self.max_age_minutes * 60:
+                # Pair vanished from DexScreener; stop asking for it
+                del self.entries[address]
+                continue
+            entry.next_poll = now + self.interval_for(entry, now)
+
+        return refreshed
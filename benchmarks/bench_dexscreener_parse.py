@@ -0,0 +1,129 @@
+"""
+Per-pair parse cost of DexScreener search results: the original loop
+(full pydantic validation for every pair, cfg check afterwards) against
+parse_pairs (raw-dict checks first, model_construct for survivors) and
+parse_pair_records (raw-dict checks first, slotted TokenRecords), plus the
+memory held per accepted token by each representation. The batch line
+times the columnar path (TokenBatch.from_pairs + filter + score).
+
+    PYTHONPATH=. python benchmarks/bench_dexscreener_parse.py --pairs 5000
+"""
+import argparse
+import random
+import time
+import tracemalloc
+
+from app.data_sources.dexscreener import parse_pairs, parse_pair_records
+from app.schemas import TokenInfo, LiquidityInfo, VolumeInfo, FiltersConfig
+from app.token_batch import TokenBatch
+
+
+def make_pairs(n, now_ms, seed=7):
+    rng = random.Random(seed)
+    pairs = []
+    for i in range(n):
+        pairs.append({
+            "chainId": "solana",
+            "pairAddress": f"PAIR{i}",
+            "baseToken": {"address": f"TOKEN{i}", "symbol": f"T{i}", "name": f"Token {i}"},
+            "priceUsd": f"{10 ** rng.uniform(-9, 1):.12f}",
+            "fdv": rng.uniform(1e4, 1e8),
+            "liquidity": {"usd": 10 ** rng.uniform(2, 7), "base": 1, "quote": 1},
+            "volume": {"m5": 1, "h1": rng.uniform(0, 1e5), "h6": 1, "h24": 1},
+            "txns": {"m5": {"buys": rng.randint(0, 50), "sells": rng.randint(0, 50)}},
+            "pairCreatedAt": now_ms - int(rng.uniform(0, 3 * 86_400_000)),
+        })
+    return pairs
+
+
+def legacy_parse(pairs, chain, cfg, max_age_minutes, now_ms):
+    """The fetch_new_listings loop before the fast path"""
+    tokens = []
+    for p in pairs:
+        created_ms = p.get("pairCreatedAt")
+        if not created_ms:
+            continue
+        age_m = int((now_ms - int(created_ms)) / 1000 / 60)
+        if age_m > max_age_minutes:
+            continue
+        liquidity = float(p.get("liquidity", {}).get("usd", 0))
+        if liquidity <= 0:
+            continue
+        volume_1h = float(p.get("volume", {}).get("h1", 0))
+        price_usd = float(p.get("priceUsd") or 0)
+        fdv_usd = float(p.get("fdv") or 0)
+        txns_5m = p.get("txns", {}).get("m5", {}) or p.get("txns", {}).get("h1", {})
+        trades_5m = int(txns_5m.get("buys", 0)) + int(txns_5m.get("sells", 0))
+        base = p.get("baseToken", {})
+        address = base.get("address", "")
+        if not address:
+            continue
+        token = TokenInfo(
+            symbol=base.get("symbol", "UNKNOWN"), chain=chain, address=address,
+            price_usd=price_usd, liquidity=LiquidityInfo(usd=liquidity),
+            volume=VolumeInfo(usd_1h=volume_1h), age_minutes=age_m,
+            fdv_usd=fdv_usd, dex_trades_5m=trades_5m,
+        )
+        if cfg:
+            if not (cfg.min_liquidity_usd <= liquidity <= cfg.max_liquidity_usd):
+                continue
+            if not (cfg.min_price_usd <= price_usd <= cfg.max_price_usd):
+                continue
+        tokens.append(token)
+    return tokens
+
+
+def bench(fn, pairs, cfg, now_ms, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        t = time.perf_counter()
+        out = fn(pairs, "solana", cfg, 4320, now_ms)
+        best = min(best, time.perf_counter() - t)
+    return best, len(out)
+
+
+def batch_parse(pairs, chain, cfg, max_age_minutes, now_ms):
+    batch = TokenBatch.from_pairs(pairs, chain, now_ms).filter(cfg.model_copy(update={"max_age_minutes": max_age_minutes}))
+    batch.score()
+    return batch
+
+
+def retained_bytes(fn, pairs, cfg, now_ms):
+    tracemalloc.start()
+    base = tracemalloc.take_snapshot()
+    out = fn(pairs, "solana", cfg, 4320, now_ms)
+    size = sum(s.size_diff for s in tracemalloc.take_snapshot().compare_to(base, "filename"))
+    tracemalloc.stop()
+    return size / max(len(out), 1)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--pairs", type=int, default=5000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    now_ms = int(time.time() * 1000)
+    pairs = make_pairs(args.pairs, now_ms)
+    cfg = FiltersConfig(min_liquidity_usd=2000, max_liquidity_usd=1_000_000,
+                        min_price_usd=1e-7, max_price_usd=0.5, max_fdv_usd=1e9)
+
+    before, kept_before = bench(legacy_parse, pairs, cfg, now_ms, args.repeat)
+    after, kept_after = bench(parse_pairs, pairs, cfg, now_ms, args.repeat)
+    records, kept_records = bench(parse_pair_records, pairs, cfg, now_ms, args.repeat)
+    batch, kept_batch = bench(batch_parse, pairs, cfg, now_ms, args.repeat)
+    assert kept_before == kept_after == kept_records == kept_batch, (kept_before, kept_after, kept_records, kept_batch)
+
+    per = lambda t: t / len(pairs) * 1e6
+    print(f"{len(pairs)} pairs, {kept_after} accepted")
+    print(f"  before:  {per(before):6.2f} us/pair")
+    print(f"  after:   {per(after):6.2f} us/pair  ({before / after:.1f}x)  TokenInfo via model_construct")
+    print(f"  records: {per(records):6.2f} us/pair  ({before / records:.1f}x)  TokenRecord")
+    print(f"  batch:   {per(batch):6.2f} us/pair  ({before / batch:.1f}x)  TokenBatch, filtered and scored")
+    print("memory per accepted token:")
+    print(f"  TokenInfo:   {retained_bytes(legacy_parse, pairs, cfg, now_ms):6.0f} B")
+    print(f"  TokenRecord: {retained_bytes(parse_pair_records, pairs, cfg, now_ms):6.0f} B")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""
+Throughput/latency benchmark for LLMClient against the local stub server.
+
+    PYTHONPATH=. python benchmarks/bench_llm_client.py --requests 200 --in-flight 1 4 16
+"""
+import argparse
+import asyncio
+import statistics
+import time
+
+from app.llm_client import LLMClient
+from benchmarks.llm_stub_server import start_stub
+
+FIELDS = dict(
+    name="Bench", symbol="BENCH", chain="solana", age_minutes=30, fdv_usd=250_000,
+    liquidity_usd=40_000, lp_lock_ratio=0.9, buy_tax_bps=0, sell_tax_bps=0,
+    holder_count=400, top1_pct=8, top5_pct=30, vol5m=5_000, vol1h=60_000,
+    trades5m=40, buyers5m=25, sellers5m=15, tw_f=1_000, tg_m=800, xm1h=10,
+    verified=True, owner_lock=True, bl_wl=False, honeypot=False,
+)
+
+
+async def run(base_url, n, in_flight, tpm):
+    client = LLMClient("stub-model", base_url=base_url, api_key="stub",
+                       max_in_flight=in_flight, tokens_per_minute=tpm, backoff_base=0.05)
+    latencies = []
+    failures = 0
+
+    async def one(i):
+        nonlocal failures
+        t = time.perf_counter()
+        try:
+            await client.evaluate({**FIELDS, "symbol": f"B{i}"})
+            latencies.append(time.perf_counter() - t)
+        except Exception:
+            failures += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(n)))
+    elapsed = time.perf_counter() - start
+    await client.aclose()
+
+    lat = sorted(latencies) or [0.0]
+    p95 = lat[min(len(lat) - 1, int(len(lat) * 0.95))]
+    print(f"in_flight={in_flight:>3}  {n / elapsed:7.1f} req/s  "
+          f"p50={statistics.median(lat) * 1000:6.0f}ms  p95={p95 * 1000:6.0f}ms  "
+          f"retries={client.retries}  failed={failures}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=100)
+    parser.add_argument("--in-flight", type=int, nargs="+", default=[1, 4, 16])
+    parser.add_argument("--tpm", type=int, default=None, help="tokens-per-minute budget")
+    parser.add_argument("--latency", type=float, default=0.2)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    args = parser.parse_args()
+
+    server, url = start_stub(latency=args.latency, jitter=args.latency / 4, error_rate=args.error_rate)
+    try:
+        for k in args.in_flight:
+            asyncio.run(run(url, args.requests, k, args.tpm))
+    finally:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,157 @@
+"""
+Scan-loop throughput with no network: a synthetic tape of DexScreener
+searches (fresh listings on every scan) and CoinGecko coin documents is
+served through the replay transport, with optional per-request latency and
+injected errors, and scan_chain is run against it back to back. Scan
+output is swallowed; only the totals are printed.
+
+    PYTHONPATH=. python benchmarks/bench_scan_replay.py --scans 20 --pairs 30 --latency 0.05 --error-rate 0.02
+
+A tape recorded from live traffic (python -m app.main --record PATH) can
+be replayed instead with --tape PATH. --workers N runs enrichment in a
+shard pool of N processes; --sweep 0,1,2,4 repeats the run in a fresh
+interpreter per worker count and prints the throughput of each:
+
+    PYTHONPATH=. python benchmarks/bench_scan_replay.py --scans 10 --latency 0.1 --sweep 0,1,2,4
+
+With latency the enrichment calls wait on I/O and the workers add
+concurrency; at zero latency the run is CPU-bound and only extra cores help.
+"""
+import argparse
+import asyncio
+import base64
+import contextlib
+import gzip
+import io
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+from benchmarks.bench_dexscreener_parse import make_pairs
+
+SEARCH_URL = "https://api.dexscreener.com/latest/dex/search?q={}"
+
+
+def entry(url, payload):
+    return json.dumps({
+        "method": "GET", "url": url, "status": 200,
+        "headers": {"content-type": "application/json"},
+        "body": base64.b64encode(json.dumps(payload).encode()).decode("ascii"), "elapsed": 0.0,
+    })
+
+
+def write_tape(path, scans, pairs_per_query, queries, coingecko_base):
+    """One version of every search per scan, each listing new tokens"""
+    now_ms = int(time.time() * 1000)
+    lines = []
+    for scan in range(scans):
+        for q, query in enumerate(queries):
+            pairs = make_pairs(pairs_per_query, now_ms, seed=scan * len(queries) + q)
+            for p in pairs:
+                address = f"{p['baseToken']['address']}S{scan}Q{q}"
+                p["baseToken"]["address"] = address
+                p["pairAddress"] += f"S{scan}Q{q}"
+                # Young enough for the default age filter
+                p["pairCreatedAt"] = now_ms - 60_000 * (1 + scan)
+                lines.append(entry(f"{coingecko_base}coins/solana/contract/{address}", {
+                    "id": address.lower(), "symbol": p["baseToken"]["symbol"],
+                    "coingecko_score": 10.0, "community_score": 5.0, "liquidity_score": 1.0,
+                    "community_data": {"twitter_followers": 100, "telegram_channel_user_count": 50},
+                }))
+            lines.append(entry(SEARCH_URL.format(query), {"schemaVersion": "1.0.0", "pairs": pairs}))
+    with gzip.open(path, "wt") as f:
+        f.write("\n".join(lines) + "\n")
+
+
+async def run(scans, cfg, coingecko, pool=None):
+    from app.main import scan_chain
+    from app.data_sources import dexscreener
+
+    seen = 0
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        for i in range(1, scans + 1):
+            seen += await scan_chain("solana", cfg, coingecko, None, None, None, None, i, pool)
+    elapsed = time.perf_counter() - start
+    await dexscreener.aclose()
+    return seen, elapsed
+
+
+def sweep(counts):
+    """One fresh interpreter per worker count so no state carries over"""
+    argv = [a for i, a in enumerate(sys.argv[1:]) if a != "--sweep" and sys.argv[i] != "--sweep"]
+    for workers in counts:
+        proc = subprocess.run([sys.executable, sys.argv[0], *argv, "--workers", str(workers)],
+                              capture_output=True, text=True)
+        if proc.returncode != 0:
+            print(f"  {workers} workers: failed ({(proc.stderr.strip().splitlines() or ['?'])[-1]})")
+            continue
+        rate = next(line.split()[0] for line in proc.stdout.splitlines() if line.strip().endswith("tokens/s"))
+        print(f"  {workers} workers: {float(rate):8.1f} tokens/s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--scans", type=int, default=20)
+    parser.add_argument("--pairs", type=int, default=30, help="pairs per search response")
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds per replayed request")
+    parser.add_argument("--jitter", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--tape", help="replay this tape instead of a synthetic one")
+    parser.add_argument("--workers", type=int, default=0, help="shard processes (0: enrich in-process)")
+    parser.add_argument("--sweep", help="comma-separated worker counts to compare")
+    args = parser.parse_args()
+
+    if args.sweep:
+        print(f"{args.scans} scans x {args.pairs} pairs, latency {args.latency * 1000:.0f} ms")
+        sweep([int(n) for n in args.sweep.split(",")])
+        return
+
+    tmp = tempfile.TemporaryDirectory()
+    tape = args.tape or os.path.join(tmp.name, "synthetic.jsonl.gz")
+    # Before anything builds an HTTP client
+    os.environ["SCOUT_HTTP_REPLAY"] = tape
+    os.environ["SCOUT_REPLAY_LATENCY"] = str(args.latency)
+    os.environ["SCOUT_REPLAY_JITTER"] = str(args.jitter)
+    os.environ["SCOUT_REPLAY_ERROR_RATE"] = str(args.error_rate)
+    os.environ["SCOUT_REPLAY_SEED"] = "1"
+
+    from app import replay
+    from app.coingecko_client import CoinGeckoClient
+    from app.data_sources.dexscreener import DEFAULT_SEARCH_QUERIES, request_stats
+    from app.schemas import FiltersConfig
+    from app.sharding import ShardPool
+
+    coingecko = CoinGeckoClient()
+    coingecko.rate_limit_delay = 0
+    if not args.tape:
+        write_tape(tape, args.scans, args.pairs, DEFAULT_SEARCH_QUERIES["solana"], coingecko.cg.api_base_url)
+
+    cfg = FiltersConfig(min_liquidity_usd=0, max_liquidity_usd=1e9, min_price_usd=0, max_price_usd=1e9,
+                        max_fdv_usd=1e12, min_holders=0)
+    pool = None
+    if args.workers:
+        # Workers replay the same tape: the environment above is inherited
+        pool = ShardPool(args.workers, cfg, {"config_path": "config.yaml", "coingecko_delay": 0})
+        pool.start()
+    try:
+        seen, elapsed = asyncio.run(run(args.scans, cfg, coingecko, pool))
+    finally:
+        if pool is not None:
+            pool.stop()
+
+    stats = replay.get_replay().stats
+    print(f"{args.scans} scans, {seen} new tokens in {elapsed:.2f}s "
+          f"(latency {args.latency * 1000:.0f} ms, error rate {args.error_rate:.0%}, {args.workers} workers)")
+    print(f"  {args.scans / elapsed:8.1f} scans/s")
+    print(f"  {seen / elapsed:8.1f} tokens/s")
+    print(f"  requests: {request_stats['requests']} DexScreener, "
+          f"{stats['served']} served, {stats['missed']} unrecorded, {stats['injected']} injected errors")
+    tmp.cleanup()
+
+
+if __name__ == "__main__":
+    main()
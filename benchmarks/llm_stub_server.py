@@ -0,0 +1,101 @@
+"""
+OpenAI-compatible stub for benchmarking LLMClient offline.
+
+Serves POST /v1/chat/completions with a canned analyst verdict (a JSON
+array for batch prompts) after a configurable latency, and can inject
+429/500 errors.
+
+    python benchmarks/llm_stub_server.py --port 8089 --latency 0.4 --error-rate 0.05
+    LLM_BASE_URL=http://127.0.0.1:8089/v1 python app/main.py ...
+"""
+import json
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class StubConfig:
+    latency = 0.3          # seconds, mean
+    jitter = 0.1           # seconds, +/- uniform
+    error_rate = 0.0       # fraction of requests answered with an error
+    error_status = 429
+    requests = 0
+
+
+def _verdict(item_id=None):
+    v = {"verdict": "speculative", "rationale": "Stub verdict.", "risks": ["stub"], "confidence_0to1": 0.5}
+    if item_id is not None:
+        v = {"id": item_id, **v}
+    return v
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    config = StubConfig
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+        self.config.requests += 1
+        time.sleep(max(0.0, self.config.latency + random.uniform(-self.config.jitter, self.config.jitter)))
+
+        if not self.path.endswith("/chat/completions"):
+            return self._send(404, {"error": "not found"})
+        if random.random() < self.config.error_rate:
+            return self._send(self.config.error_status, {"error": {"message": "stub injected error"}})
+
+        user = body.get("messages", [{}])[-1].get("content", "")
+        ids = re.findall(r"### id=(\S+)", user)
+        content = json.dumps([_verdict(i) for i in ids] if ids else _verdict())
+        self._send(200, {
+            "id": "stub",
+            "object": "chat.completion",
+            "model": body.get("model"),
+            "choices": [{"index": 0, "finish_reason": "stop", "message": {"role": "assistant", "content": content}}],
+            "usage": {"prompt_tokens": len(user) // 4, "completion_tokens": len(content) // 4},
+        })
+
+    def _send(self, status, payload):
+        data = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, *args):
+        pass
+
+
+class StubServer(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 256  # default backlog of 5 resets connections under load
+
+
+def start_stub(port=0, latency=0.3, jitter=0.1, error_rate=0.0, error_status=429):
+    """Start the stub on a background thread; returns (server, base_url)"""
+    config = type("Config", (StubConfig,), dict(latency=latency, jitter=jitter,
+                                                error_rate=error_rate, error_status=error_status))
+    handler = type("Handler", (StubHandler,), {"config": config})
+    server = StubServer(("127.0.0.1", port), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}/v1"
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="OpenAI-compatible LLM stub server")
+    parser.add_argument("--port", type=int, default=8089)
+    parser.add_argument("--latency", type=float, default=0.3)
+    parser.add_argument("--jitter", type=float, default=0.1)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--error-status", type=int, default=429)
+    args = parser.parse_args()
+
+    server, url = start_stub(args.port, args.latency, args.jitter, args.error_rate, args.error_status)
+    print(f"LLM stub listening on {url}")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
@@ -0,0 +1,56 @@
+import asyncio
+import json
+from pathlib import Path
+
+import httpx
+
+from app.data_sources.birdeye import BirdeyeSource
+
+CONFIG = Path(__file__).resolve().parent.parent / "config.yaml"
+HOLDERS = [{"amount": "600"}, {"amount": "300"}, {"amount": "100"}]
+
+
+def enrich(handler):
+    async def go():
+        source = BirdeyeSource(CONFIG)
+        source._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        try:
+            return await source.enrich_with_birdeye("MINT"), source._cache
+        finally:
+            await source.aclose()
+
+    return asyncio.run(go())
+
+
+def respond(holders, security, security_status=200):
+    def handler(request):
+        if "holder_list" in request.url.path:
+            return httpx.Response(200, content=json.dumps({"data": holders}))
+        return httpx.Response(security_status, content=json.dumps({"data": security}))
+    return handler
+
+
+def test_holders_and_revoked_mint():
+    (holders, risk), cache = enrich(respond(HOLDERS, {"mintAuthorityDisabled": True}))
+    assert holders.holder_count == 3
+    assert holders.top1_pct == 60
+    assert risk.mint_revoked is True
+    assert "MINT" in cache
+
+
+def test_missing_mint_field_is_not_revoked():
+    (_, risk), _ = enrich(respond(HOLDERS, {}))
+    assert risk.mint_revoked is False
+
+
+def test_null_data_falls_back_to_default():
+    (holders, risk), _ = enrich(respond(None, None))
+    assert holders.holder_count == 0
+    assert risk.mint_revoked is False
+
+
+def test_throttled_security_check_fails_closed_and_is_not_cached():
+    (holders, risk), cache = enrich(respond(HOLDERS, {"mintAuthorityDisabled": True}, security_status=429))
+    assert holders.holder_count == 3
+    assert risk.mint_revoked is False
+    assert cache == {}
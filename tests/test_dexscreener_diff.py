@@ -0,0 +1,103 @@
+import asyncio
+import json
+import time
+
+import httpx
+import pytest
+
+from app.data_sources import dexscreener
+from app.data_sources.dexscreener import changed_pairs, fetch_search_pairs, settle_pairs
+
+NOW_MS = 1_700_000_000_000
+
+
+@pytest.fixture(autouse=True)
+def fresh_state(monkeypatch):
+    monkeypatch.setattr(dexscreener, "_pair_fingerprints", dexscreener.OrderedDict())
+    monkeypatch.setattr(dexscreener, "_pending_pairs", {})
+    monkeypatch.setattr(dexscreener, "_response_etags", {})
+    monkeypatch.setattr(dexscreener, "_response_digests", {})
+    monkeypatch.setattr(dexscreener, "_limiters", {})
+    monkeypatch.setattr(dexscreener, "_ip_limiter", None)
+    monkeypatch.setattr(dexscreener, "_budget_share", 1.0)
+    monkeypatch.setattr(dexscreener, "_client", None)
+
+
+def pair(address, price="0.001", age_minutes=30):
+    return {
+        "chainId": "solana", "pairAddress": f"PAIR_{address}",
+        "baseToken": {"address": address, "symbol": address.upper()},
+        "priceUsd": price, "liquidity": {"usd": 10_000}, "volume": {"h1": 100, "h24": 1_000},
+        "txns": {"m5": {"buys": 1, "sells": 1}}, "fdv": 50_000,
+        "pairCreatedAt": NOW_MS - age_minutes * 60_000,
+    }
+
+
+def test_changed_pairs_does_not_record_anything():
+    pairs = [pair("a"), pair("b")]
+    assert changed_pairs(pairs) == pairs
+    assert changed_pairs(pairs) == pairs
+
+
+def test_settled_pairs_are_skipped_until_they_change():
+    settle_pairs("solana", [pair("a"), pair("b")], now_ms=NOW_MS)
+    assert changed_pairs([pair("a"), pair("b", price="0.002")]) == [pair("b", price="0.002")]
+
+
+def test_age_gated_pairs_stay_pending():
+    young, old = pair("young", age_minutes=2), pair("old", age_minutes=30)
+    settle_pairs("solana", [young, old], min_age_minutes=5, now_ms=NOW_MS)
+    assert changed_pairs([young, old]) == [young]
+    assert dexscreener._pending_pairs["solana"] == {"PAIR_young": young}
+    # Old enough at a later scan: settled like any other pair
+    settle_pairs("solana", [young], min_age_minutes=5, now_ms=NOW_MS + 10 * 60_000)
+    assert changed_pairs([young]) == []
+    assert dexscreener._pending_pairs["solana"] == {}
+
+
+def test_age_gated_pair_returned_when_search_body_is_unchanged(monkeypatch):
+    young = pair("young", age_minutes=2)
+    body = json.dumps({"pairs": [young, pair("old")]}).encode()
+
+    def handler(request):
+        return httpx.Response(200, content=body)
+
+    async def scans():
+        dexscreener._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        first = await fetch_search_pairs("solana", queries=["q"], changed_only=True)
+        settle_pairs("solana", first, min_age_minutes=5, now_ms=NOW_MS)
+        # Same bytes again: the body is not decoded, the pending pair still comes back
+        second = await fetch_search_pairs("solana", queries=["q"], changed_only=True)
+        await dexscreener.aclose()
+        return first, second
+
+    first, second = asyncio.run(scans())
+    assert len(first) == 2
+    assert dexscreener.request_stats["not_modified"] >= 1
+    assert second == [young]
+
+
+def test_failed_scan_forgets_search_responses():
+    dexscreener._response_etags[("solana", "u")] = "etag"
+    dexscreener._response_digests[("solana", "u")] = b"d"
+    dexscreener._response_digests[("base", "u")] = b"d"
+    dexscreener.forget_search_responses("solana")
+    assert dexscreener._response_etags == {}
+    assert list(dexscreener._response_digests) == [("base", "u")]
+
+
+def test_chains_draw_from_one_ip_budget(monkeypatch):
+    monkeypatch.setattr(dexscreener, "CHAIN_REQUESTS_PER_SECOND", 1_000)
+    monkeypatch.setattr(dexscreener, "IP_REQUESTS_PER_SECOND", 20)
+
+    async def hit(chain):
+        async with dexscreener._request_slot(chain):
+            pass
+
+    async def go():
+        start = time.monotonic()
+        # 30 requests over three chains: a burst of 20, then 10 more at 20/s
+        await asyncio.gather(*(hit(chain) for chain in ("solana", "base", "bsc") for _ in range(10)))
+        return time.monotonic() - start
+
+    assert asyncio.run(go()) >= 0.45
@@ -0,0 +1,66 @@
+from types import SimpleNamespace
+
+import pytest
+
+from app import ethereum_scanner
+from app.ethereum_scanner import BytecodeVerdictCache, EthereumScanner
+
+CODE = b"\x60\x80" * 600
+
+
+def fake_web3():
+    return SimpleNamespace(
+        to_checksum_address=lambda a: a,
+        keccak=lambda code: bytes(32),
+        eth=SimpleNamespace(get_code=lambda a: CODE),
+    )
+
+
+def goplus(**overrides):
+    data = {
+        'is_honeypot': False, 'buy_tax': 0.0, 'sell_tax': 0.0, 'is_open_source': True, 'is_proxy': False,
+        'is_mintable': False, 'can_take_back_ownership': False, 'owner_change_balance': False,
+        'hidden_owner': False, 'selfdestruct': False, 'holder_count': 500, 'lp_holder_count': 5,
+    }
+    data.update(overrides)
+    return data
+
+
+def scanner(monkeypatch, responses):
+    monkeypatch.setattr(ethereum_scanner, '_w3', fake_web3())
+    monkeypatch.setattr(ethereum_scanner, 'get_config', lambda: {})
+    s = EthereumScanner(cache=BytecodeVerdictCache())
+    monkeypatch.setattr(s, '_scan_with_goplus', lambda address: dict(responses[address]))
+    monkeypatch.setattr(s, '_check_verification', lambda address: True)
+    return s
+
+
+def test_clone_keeps_its_own_honeypot_and_tax(monkeypatch):
+    s = scanner(monkeypatch, {
+        '0xtemplate': goplus(),
+        '0xclone': goplus(is_honeypot=True, sell_tax=0.9),
+    })
+    assert s.scan_contract('0xtemplate')['checks']['code_cache_hit'] is False
+    clone = s.scan_contract('0xclone')
+    assert clone['checks']['code_cache_hit'] is True
+    assert clone['risk_score'] == 100
+    assert '[CRITICAL] HONEYPOT DETECTED - Cannot sell' in clone['flags']
+
+
+def test_cached_code_flags_overlay_the_address_data(monkeypatch):
+    s = scanner(monkeypatch, {
+        '0xtemplate': goplus(is_mintable=True),
+        '0xclone': goplus(holder_count=3),
+    })
+    s.scan_contract('0xtemplate')
+    data = s.scan_contract('0xclone')['checks']['goplus_data']
+    assert data['is_mintable'] is True
+    assert data['holder_count'] == 3
+
+
+def test_scanner_refuses_to_run_under_record_or_replay(monkeypatch):
+    for var in ('SCOUT_HTTP_RECORD', 'SCOUT_HTTP_REPLAY'):
+        monkeypatch.setenv(var, 'tape.jsonl.gz')
+        with pytest.raises(RuntimeError, match='bypass the tape'):
+            EthereumScanner(cache=BytecodeVerdictCache())
+        monkeypatch.delenv(var)
@@ -0,0 +1,47 @@
+import asyncio
+import time
+from collections import defaultdict
+
+import pytest
+
+from app import main
+from app.schemas import FiltersConfig
+
+
+@pytest.fixture(autouse=True)
+def fresh_state(monkeypatch):
+    monkeypatch.setattr(main, "processed_addresses", defaultdict(set))
+    monkeypatch.setattr(main, "seen_addresses", defaultdict(set))
+
+
+def pair(address, price="0.001"):
+    return {
+        "chainId": "solana", "pairAddress": f"PAIR_{address}",
+        "baseToken": {"address": address, "symbol": address.upper()},
+        "priceUsd": price, "liquidity": {"usd": 10_000}, "volume": {"h1": 100, "h24": 1_000},
+        "txns": {"m5": {"buys": 1, "sells": 1}}, "fdv": 50_000,
+        "pairCreatedAt": int(time.time() * 1000) - 30 * 60_000,
+    }
+
+
+def evaluate(pairs):
+    # Nothing passes phase one, so no enrichment client is needed
+    cfg = FiltersConfig(min_liquidity_usd=1e12)
+    return asyncio.run(main.evaluate_pairs("solana", pairs, cfg, None, None, None, 1))
+
+
+def test_counts_first_sightings_only():
+    assert evaluate([pair("a"), pair("b")]) == 2
+    # Price churn on known tokens is not a listing spike
+    assert evaluate([pair("a", price="0.002"), pair("b", price="0.003")]) == 0
+    assert evaluate([pair("a", price="0.004"), pair("c")]) == 1
+
+
+def test_failed_evaluation_does_not_mark_addresses_seen(monkeypatch):
+    def boom(*args, **kwargs):
+        raise RuntimeError("scoring failed")
+
+    monkeypatch.setattr(main.TokenBatch, "score", boom)
+    with pytest.raises(RuntimeError):
+        evaluate([pair("a")])
+    assert not main.seen_addresses["solana"]
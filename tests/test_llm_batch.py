@@ -0,0 +1,45 @@
+import json
+
+from app.llm_client import parse_llm_batch
+
+
+def item(i, verdict="watchlist", confidence=0.7):
+    return {"id": i, "verdict": verdict, "rationale": "ok", "risks": [], "confidence_0to1": confidence}
+
+
+def test_valid_items_keyed_by_id_without_id_field():
+    content = '{"results": [%s, %s]}' % (
+        '{"id": 3, "verdict": "avoid", "rationale": "r", "risks": ["x"], "confidence_0to1": 0.9}',
+        '{"id": "5", "verdict": "speculative", "rationale": "r", "risks": [], "confidence_0to1": 0.2}',
+    )
+    valid, bad = parse_llm_batch(content, ["3", "5"])
+    assert bad == []
+    assert valid["3"]["verdict"] == "avoid"
+    assert valid["5"]["verdict"] == "speculative"
+    assert "id" not in valid["3"]
+
+
+def test_missing_and_invalid_items_are_reported():
+    content = json.dumps([item(0), item(1, verdict="moon"), item(2, confidence=1.5)])
+    valid, bad = parse_llm_batch(content, ["0", "1", "2", "3"])
+    assert list(valid) == ["0"]
+    assert bad == ["1", "2", "3"]
+
+
+def test_unknown_ids_are_ignored():
+    valid, bad = parse_llm_batch(json.dumps([item(9)]), ["0"])
+    assert valid == {}
+    assert bad == ["0"]
+
+
+def test_array_recovered_from_surrounding_text():
+    content = "Here you go:\n" + json.dumps([item(0), item(1)]) + "\nDone."
+    valid, bad = parse_llm_batch(content, ["0", "1"])
+    assert sorted(valid) == ["0", "1"]
+    assert bad == []
+
+
+def test_single_object_response():
+    valid, bad = parse_llm_batch(json.dumps(item(4)), ["4"])
+    assert list(valid) == ["4"]
+    assert bad == []
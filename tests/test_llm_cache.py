@@ -0,0 +1,29 @@
+import asyncio
+
+from app.llm_cache import LLMResponseCache
+
+
+def test_oldest_write_is_evicted_first():
+    cache = LLMResponseCache(path=None, max_entries=3)
+    for key in "abcd":
+        cache.put(key, key.upper())
+    assert cache.get("a") is None
+    assert [cache.get(k) for k in "bcd"] == ["B", "C", "D"]
+    # Rewriting an entry makes it the newest
+    cache.put("b", "B2")
+    cache.put("e", "E")
+    assert cache.get("c") is None
+    assert cache.get("b") == "B2"
+
+
+def test_reload_keeps_write_order_for_eviction(tmp_path):
+    path = tmp_path / "llm_cache.json"
+    cache = LLMResponseCache(path=path, max_entries=3)
+    for key in "abc":
+        cache.put(key, key.upper())
+    asyncio.run(cache.flush())
+
+    reloaded = LLMResponseCache(path=path, max_entries=3)
+    reloaded.put("d", "D")
+    assert reloaded.get("a") is None
+    assert reloaded.get("b") == "B"
@@ -0,0 +1,51 @@
+import asyncio
+import json
+
+import httpx
+
+from app.llm_client import LLMClient
+
+OK = {"choices": [{"message": {"content": "fine"}}]}
+
+
+def client(**kwargs):
+    return LLMClient("test-model", base_url="http://llm.test", api_key="k", **kwargs)
+
+
+def test_retry_after_is_capped_and_jittered():
+    llm = client(backoff_base=0.5, max_backoff=10)
+    hostile = httpx.Response(429, headers={"retry-after": "86400"})
+    delays = {llm._backoff(0, hostile) for _ in range(20)}
+    assert all(10 <= d <= 10.5 for d in delays)
+    assert len(delays) > 1
+    assert 0 <= llm._backoff(0, httpx.Response(429, headers={"retry-after": "-5"})) <= 0.5
+
+
+def test_exponential_backoff_is_capped():
+    llm = client(backoff_base=0.5, max_backoff=2)
+    assert all(0 <= llm._backoff(20) <= 2 for _ in range(20))
+
+
+def test_every_attempt_is_charged_to_the_token_budget(monkeypatch):
+    statuses = iter([503, 503, 200])
+    charged = []
+
+    def handler(request):
+        status = next(statuses)
+        return httpx.Response(status, content=json.dumps(OK if status == 200 else {}))
+
+    async def go():
+        llm = client(tokens_per_minute=100_000, backoff_base=0)
+
+        async def wait(cost=1.0):
+            charged.append(cost)
+
+        monkeypatch.setattr(llm._tpm, "wait", wait)
+        llm._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        try:
+            return await llm.chat("s" * 40, "u" * 40, max_tokens=100)
+        finally:
+            await llm.aclose()
+
+    assert asyncio.run(go()) == "fine"
+    assert charged == [120, 120, 120]
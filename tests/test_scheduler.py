@@ -0,0 +1,54 @@
+from app.scheduler import ScanScheduler
+
+
+def test_throttling_and_errors_back_off_up_to_max():
+    s = ScanScheduler(interval=60, min_interval=15, max_interval=300)
+    assert s.record(new_count=5, throttled=1) == 120
+    assert s.record(error=True) == 240
+    assert s.record(error=True) == 300
+
+
+def test_spike_tightens_down_to_min():
+    s = ScanScheduler(interval=60, min_interval=15, max_interval=300, spike_ratio=2.0)
+    s.record(new_count=4)
+    assert s.record(new_count=20) == 30
+    assert s.record(new_count=200) == 15
+
+
+def test_quiet_scans_stretch_then_drift_back():
+    s = ScanScheduler(interval=60)
+    assert s.record(new_count=0) == 75
+    assert s.record(new_count=0) == 93.75
+    # Ordinary activity moves halfway back to the configured interval
+    assert s.record(new_count=1) == 76.875
+
+
+def test_failed_scan_does_not_update_average():
+    s = ScanScheduler(interval=60)
+    s.record(new_count=10)
+    s.record(error=True)
+    assert s.avg_new == 10
+
+
+def test_bounds_include_configured_interval():
+    s = ScanScheduler(interval=10, min_interval=15, max_interval=5)
+    assert (s.min_interval, s.max_interval) == (10, 10)
+
+
+def test_delay_is_measured_from_scan_start(monkeypatch):
+    clock = [1000.0]
+    monkeypatch.setattr("app.scheduler.time.monotonic", lambda: clock[0])
+    s = ScanScheduler(interval=60)
+    s.start()
+    clock[0] += 45
+    assert s.delay() == 15
+    clock[0] += 30
+    assert s.delay() == 0
+
+
+def test_copy_keeps_settings_not_state():
+    s = ScanScheduler(interval=60, min_interval=20, max_interval=200, spike_ratio=3, smoothing=0.5)
+    s.record(error=True)
+    c = s.copy()
+    assert (c.base_interval, c.min_interval, c.max_interval, c.spike_ratio, c.smoothing) == (60, 20, 200, 3, 0.5)
+    assert c.interval == 60 and c.avg_new is None
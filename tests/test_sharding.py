@@ -0,0 +1,109 @@
+import asyncio
+import queue
+
+import pytest
+
+from app.records import TokenRecord
+from app.schemas import FiltersConfig
+from app.sharding import PARENT_DEXSCREENER_SHARE, ShardPool, dexscreener_shares, shard_of
+
+
+def pool(workers=2, timeout=5):
+    """A pool with queues but no processes, fed by hand"""
+    p = ShardPool(workers, FiltersConfig(), timeout=timeout)
+    p._inboxes = [queue.Queue() for _ in range(workers)]
+    p._collector = object()
+    return p
+
+
+def records(n):
+    return [TokenRecord(f"T{i}", "solana", f"addr{i}") for i in range(n)]
+
+
+def test_results_gathered_across_shards():
+    async def go():
+        p = pool()
+        p._loop = asyncio.get_running_loop()
+        tokens = records(8)
+        task = asyncio.create_task(p.process("solana", tokens))
+        await asyncio.sleep(0)
+        for inbox in p._inboxes:
+            while not inbox.empty():
+                _, request_id, _, part = inbox.get()
+                p._on_result(request_id, shard_of(part[0].address, 2), part)
+        return tokens, await task, p._pending
+
+    tokens, out, pending = asyncio.run(go())
+    assert sorted(t.address for t in out) == sorted(t.address for t in tokens)
+    assert pending == {}
+
+
+def test_worker_error_fails_the_batch():
+    async def go():
+        p = pool(workers=1)
+        p._loop = asyncio.get_running_loop()
+        task = asyncio.create_task(p.process("solana", records(2)))
+        await asyncio.sleep(0)
+        _, request_id, _, _ = p._inboxes[0].get()
+        p._on_result(request_id, 0, [], "ValueError: boom")
+        with pytest.raises(RuntimeError, match="boom"):
+            await task
+        return p._pending
+
+    assert asyncio.run(go()) == {}
+
+
+def test_dead_worker_fails_only_its_own_batches():
+    on_0 = [t for t in records(20) if shard_of(t.address, 2) == 0][:2]
+    on_1 = [t for t in records(20) if shard_of(t.address, 2) == 1][:2]
+
+    async def go():
+        p = pool()
+        p._loop = asyncio.get_running_loop()
+        hit = asyncio.create_task(p.process("solana", on_0 + on_1))
+        spared = asyncio.create_task(p.process("solana", on_1))
+        await asyncio.sleep(0)
+        p._fail_shard(0, RuntimeError("shard worker 0 exited"))
+        with pytest.raises(RuntimeError, match="worker 0"):
+            await hit
+        assert not spared.done()
+        while not p._inboxes[1].empty():
+            _, request_id, _, part = p._inboxes[1].get()
+            p._on_result(request_id, 1, part)
+        return await spared, p._pending
+
+    out, pending = asyncio.run(go())
+    assert out == on_1
+    assert pending == {}
+
+
+def test_closed_result_queue_fails_everything_pending():
+    async def go():
+        p = pool()
+        p._loop = asyncio.get_running_loop()
+        tasks = [asyncio.create_task(p.process("solana", records(3))) for _ in range(2)]
+        await asyncio.sleep(0)
+        p._fail_all(RuntimeError("shard result queue closed"))
+        return await asyncio.gather(*tasks, return_exceptions=True), p._pending
+
+    results, pending = asyncio.run(go())
+    assert all(isinstance(r, RuntimeError) for r in results)
+    assert pending == {}
+
+
+def test_parent_keeps_dexscreener_share_for_discovery():
+    assert dexscreener_shares(4, {}) == (1.0, 0.0)
+    parent, worker = dexscreener_shares(4, {"watchlist": {}})
+    assert parent == PARENT_DEXSCREENER_SHARE
+    assert parent + 4 * worker == pytest.approx(1.0)
+
+
+def test_unanswered_batch_times_out():
+    async def go():
+        p = pool(timeout=0.05)
+        p._loop = asyncio.get_running_loop()
+        with pytest.raises(asyncio.TimeoutError):
+            await p.process("solana", records(1))
+        return p._pending
+
+    assert asyncio.run(go()) == {}
@@ -0,0 +1,71 @@
+import asyncio
+
+import pytest
+
+from app.singleflight import SingleFlight
+
+
+def test_concurrent_callers_share_one_call():
+    calls = []
+
+    async def fetch(key):
+        calls.append(key)
+        await asyncio.sleep(0.01)
+        return key.upper()
+
+    async def run():
+        inflight = SingleFlight()
+        results = await asyncio.gather(*(inflight.do("a", fetch, "a") for _ in range(5)),
+                                       inflight.do("b", fetch, "b"))
+        return inflight, results
+
+    inflight, results = asyncio.run(run())
+    assert results == ["A"] * 5 + ["B"]
+    assert sorted(calls) == ["a", "b"]
+    assert (inflight.calls, inflight.shared) == (2, 4)
+    assert inflight.in_flight() == 0
+
+
+def test_finished_calls_are_not_remembered():
+    calls = []
+
+    async def fetch():
+        calls.append(1)
+        return len(calls)
+
+    async def run():
+        inflight = SingleFlight()
+        return await inflight.do("k", fetch), await inflight.do("k", fetch)
+
+    assert asyncio.run(run()) == (1, 2)
+
+
+def test_exception_reaches_every_waiter():
+    async def fail():
+        await asyncio.sleep(0.01)
+        raise ValueError("upstream down")
+
+    async def run():
+        inflight = SingleFlight()
+        return await asyncio.gather(inflight.do("k", fail), inflight.do("k", fail), return_exceptions=True)
+
+    results = asyncio.run(run())
+    assert all(isinstance(r, ValueError) for r in results)
+
+
+def test_cancelled_caller_does_not_cancel_shared_call():
+    async def slow():
+        await asyncio.sleep(0.02)
+        return "done"
+
+    async def run():
+        inflight = SingleFlight()
+        first = asyncio.ensure_future(inflight.do("k", slow))
+        second = asyncio.ensure_future(inflight.do("k", slow))
+        await asyncio.sleep(0)
+        first.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await first
+        return await second
+
+    assert asyncio.run(run()) == "done"
@@ -0,0 +1,78 @@
+import numpy as np
+
+from app.schemas import FiltersConfig
+from app.token_batch import TokenBatch
+
+NOW_MS = 1_700_000_000_000
+
+
+def pair(address, liquidity=10_000, price=0.001, age_minutes=30, volume_1h=2_000, fdv=100_000, trades=10):
+    return {
+        "baseToken": {"address": address, "symbol": address.upper(), "name": address},
+        "priceUsd": str(price),
+        "liquidity": {"usd": liquidity},
+        "volume": {"h1": volume_1h, "h24": volume_1h * 10},
+        "fdv": fdv,
+        "txns": {"m5": {"buys": trades // 2, "sells": trades - trades // 2}},
+        "pairCreatedAt": NOW_MS - age_minutes * 60_000,
+    }
+
+
+def cfg(**overrides):
+    base = dict(min_liquidity_usd=1_000, max_liquidity_usd=1_000_000, min_price_usd=1e-7, max_price_usd=1.0,
+                max_fdv_usd=1e9, min_age_minutes=0, max_age_minutes=2_880, min_dex_trades_5m=0, min_volume_usd_1h=0)
+    base.update(overrides)
+    return FiltersConfig(**base)
+
+
+def test_from_pairs_drops_rows_without_address_or_creation_time():
+    pairs = [pair("a"), {"baseToken": {}, "pairCreatedAt": NOW_MS}, dict(pair("b"), pairCreatedAt=None)]
+    batch = TokenBatch.from_pairs(pairs, now_ms=NOW_MS)
+    assert list(batch.address) == ["a"]
+    assert batch.age_minutes[0] == 30
+    assert batch.trades_5m[0] == 10
+
+
+def test_pre_filter_mask_applies_each_rule():
+    batch = TokenBatch.from_pairs([
+        pair("ok"),
+        pair("thin", liquidity=500),
+        pair("deep", liquidity=5_000_000),
+        pair("pricey", price=5),
+        pair("old", age_minutes=5_000),
+        pair("fdv", fdv=1e12),
+        pair("no_fdv", fdv=0),
+    ], now_ms=NOW_MS)
+    mask = batch.pre_filter_mask(cfg())
+    assert dict(zip(batch.address, mask)) == {
+        "ok": True, "thin": False, "deep": False, "pricey": False, "old": False, "fdv": False, "no_fdv": True,
+    }
+
+
+def test_pre_filter_mask_activity_thresholds_only_when_set():
+    batch = TokenBatch.from_pairs([pair("quiet", trades=1, volume_1h=10)], now_ms=NOW_MS)
+    assert batch.pre_filter_mask(cfg()).tolist() == [True]
+    assert batch.pre_filter_mask(cfg(min_dex_trades_5m=5)).tolist() == [False]
+    assert batch.pre_filter_mask(cfg(min_volume_usd_1h=100)).tolist() == [False]
+
+
+def test_exclude_drops_known_addresses():
+    batch = TokenBatch.from_pairs([pair("a"), pair("b"), pair("c")], now_ms=NOW_MS)
+    assert list(batch.exclude({"b"}).address) == ["a", "c"]
+    assert batch.exclude(set()) is batch
+
+
+def test_argtop_k_best_first_with_nan_last():
+    batch = TokenBatch.from_pairs([pair(str(i)) for i in range(6)], now_ms=NOW_MS)
+    batch.columns['score_total'] = np.array([5.0, np.nan, 9.0, 1.0, 7.0, np.nan])
+    assert batch.argtop_k(3).tolist() == [2, 4, 0]
+    assert batch.argtop_k(3, descending=False).tolist() == [3, 0, 4]
+    # k past the end falls back to a full sort
+    assert batch.argtop_k(10).tolist()[:4] == [2, 4, 0, 3]
+
+
+def test_argtop_k_matches_full_sort():
+    rng = np.random.default_rng(0)
+    batch = TokenBatch.from_pairs([pair(str(i)) for i in range(200)], now_ms=NOW_MS)
+    batch.columns['score_total'] = rng.permutation(200).astype(np.float64)
+    assert batch.argtop_k(10).tolist() == batch.argsort()[:10].tolist()
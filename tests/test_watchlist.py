@@ -0,0 +1,73 @@
+import asyncio
+import time
+
+from app import watchlist as watchlist_module
+from app.records import TokenRecord
+from app.watchlist import Watchlist
+
+
+def record(address, age_minutes=5, price=1.0):
+    return TokenRecord(symbol=address.upper(), chain="solana", address=address, price_usd=price,
+                       age_minutes=age_minutes)
+
+
+def test_first_poll_one_fast_interval_after_add():
+    w = Watchlist(fast_interval=30)
+    w.add(record("a"), now=100)
+    assert w.due(now=129) == []
+    assert w.due(now=130) == ["a"]
+    assert w.next_due_in(now=110) == 20
+
+
+def test_add_ignores_known_address():
+    w = Watchlist()
+    w.add(record("a"), now=0)
+    w.add(record("a"), now=50)
+    assert w.entries["a"].added_at == 0
+
+
+def test_interval_decays_after_fast_window():
+    w = Watchlist(fast_interval=30, fast_window_minutes=10, slow_interval=300)
+    w.add(record("a"), now=0)
+    entry = w.entries["a"]
+    assert w.interval_for(entry, now=599) == 30
+    assert w.interval_for(entry, now=600) == 300
+
+
+def test_empty_list_waits_fast_interval():
+    assert Watchlist(fast_interval=30).next_due_in() == 30
+
+
+def test_poll_refreshes_reschedules_and_drops(monkeypatch):
+    async def fake_fetch(addresses, chain):
+        return {"fresh": record("fresh", price=2.0), "aged": record("aged", age_minutes=1_000)}
+
+    monkeypatch.setattr(watchlist_module, "fetch_pairs_by_tokens", fake_fetch)
+    w = Watchlist(fast_interval=30, max_age_minutes=720)
+    for address in ("fresh", "aged", "gone", "missing"):
+        w.add(record(address), now=0)
+    # Vanished for longer than max_age_minutes
+    w.entries["gone"].added_at = -720 * 60 - 1
+
+    refreshed = asyncio.run(w.poll(now=30))
+    assert [e.record.address for e in refreshed] == ["fresh"]
+    assert w.entries["fresh"].record.price_usd == 2.0
+    assert sorted(w.entries) == ["fresh", "missing"]
+    assert w.entries["fresh"].next_poll == 60
+    assert w.entries["missing"].next_poll == 60
+
+
+def test_wait_due_wakes_when_a_token_is_added():
+    w = Watchlist(fast_interval=0.05, fast_window_minutes=0, slow_interval=5)
+    w.add(record("old"), now=time.monotonic() - 10)
+    w.entries["old"].next_poll = time.monotonic() + 5
+
+    async def run():
+        waiter = asyncio.ensure_future(w.wait_due())
+        await asyncio.sleep(0.01)
+        w.add(record("new"))
+        await asyncio.wait_for(waiter, 1)
+        # The loop re-arms on the new entry's fast interval, not the slow one
+        return w.next_due_in()
+
+    assert asyncio.run(run()) <= 0.05